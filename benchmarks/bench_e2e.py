@@ -0,0 +1,79 @@
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from steam_csgo import CSGOApi
+from steam_csgo.metrics import MetricsRegistry
+from steam_csgo.scheduler import RateLimitScheduler
+
+from .fake_steam import FakeSteam
+
+
+def make_api(fake, args, metrics=None):
+    scheduler = RateLimitScheduler(default_rate=1000.0, burst=1000) if args.scheduler else None
+    api = CSGOApi('benchmark', _parser=args.parser, _scheduler=scheduler, _transport=fake.transport(),
+                  _metrics=metrics)
+    api.login_in('benchmark', 'benchmark')
+    return api
+
+
+def run_once(fake, args):
+    api = make_api(fake, args)
+    fake.reset_counters()
+    start = time.perf_counter()
+    me, games = api.main()
+    elapsed = time.perf_counter() - start
+    matches = sum(len(mode_games) for mode_games in games.values())
+    return elapsed, matches, sum(fake.requests.values()) + fake.throttled
+
+
+def peak_memory(fake, args):
+    api = make_api(fake, args)
+    tracemalloc.start()
+    try:
+        api.main()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run CSGOApi.main() end to end against a local Steam stand-in")
+    parser.add_argument('--sizes', default='100,1000,10000', help="comma separated history sizes (matches)")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every server response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument('--parser', default='bs4')
+    parser.add_argument('--scheduler', action='store_true', help="route requests through a RateLimitScheduler")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run")
+    parser.add_argument('--metrics', action='store_true', help="print metrics of an instrumented run per size")
+    args = parser.parse_args()
+
+    print("%8s %10s %12s %10s %10s %10s %10s" % ("matches", "seconds", "matches/sec", "req/match",
+                                                 "p50", "p99", "peak MiB"))
+    for size in [int(size) for size in args.sizes.split(',')]:
+        with FakeSteam(size, latency=args.latency, error_rate=args.error_rate) as fake:
+            results = [run_once(fake, args) for _ in range(args.runs)]
+            peak = None if args.no_memory else peak_memory(fake, args)
+            if args.metrics:
+                metrics = MetricsRegistry()
+                make_api(fake, args, metrics).main()
+        timings = [elapsed for elapsed, _, _ in results]
+        _, matches, requests = results[-1]
+        total = sum(timings)
+        print("%8d %10.3f %12.1f %10.3f %10.3f %10.3f %10s" % (
+            matches, total / len(timings), matches * len(timings) / total, requests / max(matches, 1),
+            statistics.median(timings), percentile(timings, 99),
+            '-' if peak is None else "%.1f" % (peak / 1048576.0)))
+        if args.metrics:
+            print(metrics.to_prometheus())
+
+
+if __name__ == '__main__':
+    main()
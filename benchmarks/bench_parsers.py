@@ -0,0 +1,45 @@
+import argparse
+import time
+
+from steam_csgo import CSGOApi
+from steam_csgo.parsers import parser_backends
+
+from .fixtures import FIXTURES_DIR, load_fixtures, make_fixtures
+
+
+def run_backend(backend, fixtures, repeat):
+    api = CSGOApi('benchmark', _parser=backend)
+    results = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = []
+        for fixture in fixtures:
+            api.steamid = fixture['steamid']
+            results.append(api.parse_games(fixture['gamemode'], fixture['html']))
+    elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare match history parser backends")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR,
+                        help="directory with recorded gcpd AJAX pages ({gamemode, steamid, html} json)")
+    parser.add_argument('--pages', type=int, default=25, help="synthetic pages per gamemode added to recorded ones")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    recorded = load_fixtures(args.fixtures)
+    fixtures = recorded + make_fixtures(args.pages)
+    print("%d recorded and %d synthetic pages" % (len(recorded), len(fixtures) - len(recorded)))
+    reference, reference_time = run_backend('bs4', fixtures, args.repeat)
+    matches = sum(len(page) for page in reference) * args.repeat
+    print("%-8s %10s %12s %8s" % ("backend", "seconds", "matches/sec", "speedup"))
+    print("%-8s %10.3f %12.1f %8.2f" % ('bs4', reference_time, matches / reference_time, 1))
+    for backend in sorted(parser_backends):
+        results, elapsed = run_backend(backend, fixtures, args.repeat)
+        assert results == reference, "%s backend output differs from bs4" % backend
+        print("%-8s %10.3f %12.1f %8.2f" % (backend, elapsed, matches / elapsed, reference_time / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from .fake_steam import FakeSteam
+
+HEAVY_MODULES = ['bs4', 'requests', 'steam.webauth', 'steam.webapi', 'steam.core.cm', 'steam.core.crypto',
+                 'concurrent.futures.process', 'asyncio']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import steam_csgo
+imported = time.perf_counter()
+loaded = [name for name in %(heavy)r if name in sys.modules]
+from functools import partial
+from benchmarks.fake_steam import FakeSteamAdapter
+
+class Server(object):
+    url = %(url)r
+
+api = steam_csgo.CSGOApi('benchmark', _scheduler=None, _transport={'adapter_class': partial(FakeSteamAdapter, Server)})
+api.login_in('benchmark', 'benchmark')
+api.webclient.get_(api.webclient.steam_id.community_url)
+first_request = time.perf_counter()
+print(json.dumps({'import': imported - start, 'first_request': first_request - start, 'loaded': loaded}))
+"""
+
+
+def probe(url):
+    output = subprocess.check_output([sys.executable, '-c', PROBE % {'heavy': HEAVY_MODULES, 'url': url}])
+    return json.loads(output.decode('utf8').strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time to first request in fresh interpreters")
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    with FakeSteam(10) as fake:
+        results = [probe(fake.url) for _ in range(args.runs)]
+    for name in ['import', 'first_request']:
+        values = [result[name] * 1000 for result in results]
+        print("%-14s median %8.1f ms  min %8.1f ms  max %8.1f ms" % (name, statistics.median(values), min(values),
+                                                                     max(values)))
+    print("heavy modules loaded by import: %s" % (', '.join(results[-1]['loaded']) or 'none'))
+
+
+if __name__ == '__main__':
+    main()
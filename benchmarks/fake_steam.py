@@ -0,0 +1,218 @@
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from steam_csgo.transport import TimeoutHTTPAdapter
+
+from .fixtures import ACCOUNT_ID, PAGE_SIZE, account_steamid, make_page, page_index
+
+API_KEY = "0123456789ABCDEF0123456789ABCDEF"
+
+PROFILE_HTML = """<html><body>
+<div class="playerAvatar profile_header_size online">
+<div class="playerAvatarAutoSizeInner"><img src="https://avatars.akamai.steamstatic.com/%(avatar)s_full.jpg"></div>
+</div>
+<div class="persona_name"><span class="actual_persona_name">Benchmark player</span></div>
+<div class="header_real_name ellipsis"><bdi>Bench Mark</bdi>
+<img class="profile_flag" src="https://community.akamai.steamstatic.com/public/images/countryflags/ua.gif">
+</div>
+<div class="persona_level"><div class="friendPlayerLevel lvl_10"><span class="friendPlayerLevelNum">17</span></div></div>
+</body></html>"""
+
+MATCHMAKING_HTML = """<html><body><div id="personaldata_elements_container">
+<table class="generic_kv_table"><tr><th>Matchmaking Mode</th><th>Wins</th><th>Ties</th><th>Losses</th>
+<th>Skill Group</th><th>Last Match</th></tr>
+<tr><td>Competitive</td><td>412</td><td>31</td><td>380</td><td>15</td><td>2020-12-31 20:00:00 GMT</td></tr>
+<tr><td>Wingman</td><td>120</td><td>4</td><td>99</td><td>11</td><td>2020-12-30 18:00:00 GMT</td></tr>
+</table>
+<table class="generic_kv_table"><tr><th>Competitive Cooldown Expiration</th><th>Competitive Cooldown Level</th></tr>
+<tr><td>2020-12-31 21:00:00 GMT</td><td>1</td></tr>
+</table>
+</div></body></html>"""
+
+APIKEY_HTML = """<html><body><div id="bodyContents_ex"><h2>Your Steam Web API Key</h2>
+<p>Key: %s</p><p>Domain Name: csgohelper</p>
+<form><input type="submit" name="Revoke" value="Revoke My Steam Web API Key"></form></div></body></html>"""
+
+
+class FakeSteamAdapter(TimeoutHTTPAdapter):
+    def __init__(self, server, timeout=None, **kwargs):
+        self.server = server
+        super().__init__(timeout, **kwargs)
+
+    def send(self, request, **kwargs):
+        url = request.url
+        parts = urlsplit(url)
+        request.url = "%s/%s%s%s" % (self.server.url, parts.hostname, parts.path,
+                                     "?" + parts.query if parts.query else "")
+        resp = super().send(request, **kwargs)
+        resp.url = url
+        return resp
+
+
+class FakeSteam(object):
+    def __init__(self, matches=1000, latency=0.0, error_rate=0.0, seed=0, account_id=ACCOUNT_ID,
+                 page_size=PAGE_SIZE, banned_rate=0.02):
+        self.matches = {'matchhistorycompetitive': matches - matches // 4,
+                        'matchhistorywingman': matches // 4}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.account_id = account_id
+        self.steamid = account_steamid(account_id)
+        self.page_size = page_size
+        self.banned_rate = banned_rate
+        self.requests = Counter()
+        self.throttled = 0
+        self.httpd = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self.httpd.server_port
+
+    def adapter_class(self, timeout=None, **kwargs):
+        return FakeSteamAdapter(self, timeout, **kwargs)
+
+    def transport(self, **kwargs):
+        return dict(kwargs, adapter_class=self.adapter_class)
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                fake.handle(self)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self.form = parse_qs(self.rfile.read(length).decode('utf8'))
+                fake.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests.clear()
+            self.throttled = 0
+
+    def handle(self, handler):
+        parts = urlsplit(handler.path)
+        path = parts.path.split('/', 2)[-1] if parts.path.count('/') > 1 else ''
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            throttle = self.error_rate and self._random.random() < self.error_rate
+            if throttle:
+                self.throttled += 1
+        if throttle:
+            return self.respond(handler, 429, b'', 'text/plain', {'Retry-After': '0'})
+        endpoint, status, body, content_type, headers = self.route(path, query)
+        with self._lock:
+            self.requests[endpoint] += 1
+        self.respond(handler, status, body, content_type, headers)
+
+    def route(self, path, query):
+        if path.startswith('login/getrsakey'):
+            return 'getrsakey', 200, json.dumps({
+                "success": True, "publickey_mod": "c4a9" * 63 + "c4ab", "publickey_exp": "010001",
+                "timestamp": "1234567890", "token_gid": "abc"}), 'application/json', {}
+        if path.startswith('login/dologin'):
+            return 'dologin', 200, json.dumps({
+                "success": True, "login_complete": True,
+                "transfer_parameters": {"steamid": self.steamid, "token_secure": "secure", "auth": "auth"}
+            }), 'application/json', {'Set-Cookie': 'steamLoginSecure=%s%%7C%%7Csecure; Path=/' % self.steamid}
+        if path.startswith('chat/clientjstoken'):
+            return 'clientjstoken', 200, json.dumps({"logged_in": True, "steamid": self.steamid}), \
+                'application/json', {}
+        if path.startswith('dev/apikey'):
+            return 'apikey', 200, APIKEY_HTML % API_KEY, 'text/html', {}
+        if path.startswith('ISteamUser/GetPlayerBans'):
+            return 'GetPlayerBans', 200, json.dumps({"players": [
+                self.player_ban(steamid) for steamid in query.get('steamids', '').split(',') if steamid.strip()
+            ]}), 'application/json', {}
+        if path.startswith('ISteamUser/GetPlayerSummaries'):
+            return 'GetPlayerSummaries', 200, json.dumps({"response": {"players": [
+                self.player_summary(steamid) for steamid in query.get('steamids', '').split(',') if steamid.strip()
+            ]}}), 'application/json', {}
+        if path.startswith('ISteamUser/ResolveVanityURL'):
+            steamid = self.vanity_steamid(query.get('vanityurl', ''))
+            return 'ResolveVanityURL', 200, json.dumps({"response": {"steamid": steamid, "success": 1} if steamid else
+                                                        {"success": 42, "message": "No match"}}), \
+                'application/json', {}
+        if '/gcpd/730' in path:
+            tab = query.get('tab')
+            if tab in self.matches and query.get('ajax'):
+                page = make_page(tab.replace('matchhistory', ''), page_index(query.get('continue_token')),
+                                 self.matches[tab], self.seed, self.account_id, self.page_size)
+                return tab, 200, json.dumps(page), 'application/json', {}
+            return 'matchmaking', 200, MATCHMAKING_HTML, 'text/html', {}
+        if path.startswith('id/'):
+            steamid = self.vanity_steamid(path.split('/')[1])
+            if steamid is None:
+                return 'profile', 404, '', 'text/html', {}
+            return 'profile', 200, PROFILE_HTML % {'avatar': "%040x" % self.account_id} + \
+                '<script>g_rgProfileData = {"url":"","steamid":"%s","personaname":""};\n</script>' % steamid, \
+                'text/html', {}
+        if path.startswith('profiles/'):
+            return 'profile', 200, PROFILE_HTML % {'avatar': "%040x" % self.account_id}, 'text/html', {}
+        return 'not_found', 404, '', 'text/plain', {}
+
+    def vanity_steamid(self, vanity):
+        if vanity.startswith('player') and vanity[6:].isdigit():
+            return account_steamid(int(vanity[6:]))
+        return None
+
+    def player_summary(self, steamid):
+        steamid = steamid.strip()
+        account_id = int(steamid) - 76561197960265728
+        return {"steamid": steamid, "communityvisibilitystate": 3, "profilestate": 1,
+                "personaname": "Benchmark player" if account_id == self.account_id else "Player & %d" % account_id,
+                "profileurl": "https://steamcommunity.com/profiles/%s/" % steamid,
+                "avatarfull": "https://avatars.akamai.steamstatic.com/%040x_full.jpg" % account_id,
+                "personastate": 1, "realname": "Bench Mark", "loccountrycode": "UA"}
+
+    def player_ban(self, steamid):
+        steamid = steamid.strip()
+        banned = random.Random(steamid).random() < self.banned_rate
+        return {"SteamId": steamid, "CommunityBanned": False, "VACBanned": banned,
+                "NumberOfVACBans": 1 if banned else 0, "DaysSinceLastBan": 120 if banned else 0,
+                "NumberOfGameBans": 0, "EconomyBan": "none"}
+
+    def respond(self, handler, status, body, content_type, headers):
+        if isinstance(body, str):
+            body = body.encode('utf8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type + '; charset=utf-8')
+        handler.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
@@ -0,0 +1,117 @@
+import datetime
+import json
+import os
+import random
+
+from steam.steamid import make_steam64
+
+MAPS = ['Dust II', 'Mirage', 'Inferno', 'Nuke', 'Overpass', 'Vertigo', 'Ancient', 'Train', 'Cache']
+ACCOUNT_ID = 12345678
+PAGE_SIZE = 8
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def account_steamid(account_id=ACCOUNT_ID):
+    return str(make_steam64(account_id))
+
+
+def make_player_row(rnd, account_id):
+    if account_id % 3:
+        link = "https://steamcommunity.com/profiles/%s" % make_steam64(account_id)
+    else:
+        link = "https://steamcommunity.com/id/player%d/" % account_id
+    avatar = "%040x" % rnd.getrandbits(160)
+    icon = "https://steamcdn-a.akamaihd.net/steamcommunity/public/images/avatars/%s/%s.jpg" % (avatar[:2], avatar)
+    mvps = rnd.randint(0, 6)
+    return (
+        '<tr>'
+        '<td class="inner_name">'
+        '<div class="playerAvatar offline"><a href="%(link)s" data-miniprofile="%(id)s">'
+        '<img src="%(icon)s" data-miniprofile="%(id)s"></a></div>'
+        '<div class="playerNickname ellipsis"><a class="linkTitle" href="%(link)s">Player &amp; %(id)s</a></div>'
+        '</td>'
+        '<td>%(ping)s</td><td>%(kills)s</td><td>%(assists)s</td><td>%(deaths)s</td>'
+        '<td>%(mvps)s</td><td>%(hsp)s</td><td>%(score)s</td>'
+        '</tr>\n' % {
+            'link': link, 'id': account_id, 'icon': icon, 'ping': rnd.randint(5, 120),
+            'kills': rnd.randint(0, 40), 'assists': rnd.randint(0, 12), 'deaths': rnd.randint(0, 30),
+            'mvps': ('&#9733;%d' % mvps) if mvps > 1 else ('&#9733;' if mvps else '&nbsp;'),
+            'hsp': ('%d%%' % rnd.randint(0, 100)) if rnd.random() > 0.1 else '&nbsp;',
+            'score': rnd.randint(0, 90),
+        }
+    )
+
+
+def make_match(rnd, gamemode, date, account_id=ACCOUNT_ID):
+    player_counts = 5 if gamemode == 'competitive' else 2
+    rounds = 16 if gamemode == 'competitive' else 9
+    score = [rnd.randint(0, rounds - 1), rounds] if rnd.random() > 0.5 else [rounds, rnd.randint(0, rounds - 1)]
+    if rnd.random() < 0.05:
+        score = [rounds - 1, rounds - 1]
+    account_ids = [rnd.randint(1000, 400000000) for _ in range(player_counts * 2)]
+    account_ids[rnd.randrange(len(account_ids))] = account_id
+    left = (
+        '<td class="val_left"><table class="csgo_scoreboard_inner_left"><tbody>\n'
+        '<tr><td>\n\t\t\t\t\t\t%s %s\t\t\t\t\t</td></tr>\n'
+        '<tr><td>\n\t\t\t\t\t\t%s\t\t\t\t\t</td></tr>\n'
+        '<tr><td>\n\t\t\t\t\t\tWait Time: %02d:%02d\t\t\t\t\t</td></tr>\n'
+        '<tr><td>\n\t\t\t\t\t\tMatch Duration: %02d:%02d\t\t\t\t\t</td></tr>\n' % (
+            gamemode.capitalize(), rnd.choice(MAPS), date.strftime("%Y-%m-%d %H:%M:%S GMT"),
+            rnd.randint(0, 9), rnd.randint(0, 59), rnd.randint(15, 60), rnd.randint(0, 59))
+    )
+    if rnd.random() > 0.3:
+        left += ('<tr><td class="csgo_scoreboard_cell_noborder"><a href="http://replay%d.valve.net/730/%d.dem.bz2">'
+                 '<div class="csgo_scoreboard_btn_gotv">Download GOTV Replay</div></a></td></tr>\n' % (
+                     rnd.randint(100, 300), rnd.getrandbits(60)))
+    left += '</tbody></table></td>\n'
+    right = (
+        '<td class="val_right"><table class="csgo_scoreboard_inner_right"><tbody>\n'
+        '<tr><th>Player Name</th><th>Ping</th><th>K</th><th>A</th><th>D</th>'
+        '<th>&#9733;</th><th>HSP</th><th>Score</th></tr>\n'
+    )
+    for team in range(2):
+        if team:
+            right += ('<tr><td colspan="8" class="csgo_scoreboard_score">%d : %d</td></tr>\n' % tuple(score))
+        for j in range(player_counts):
+            right += make_player_row(rnd, account_ids[team * player_counts + j])
+    right += '</tbody></table></td>\n'
+    return '<tr>\n' + left + right + '</tr>\n'
+
+
+def make_page(gamemode, page, matches, seed=0, account_id=ACCOUNT_ID, page_size=PAGE_SIZE):
+    rnd = random.Random("%s:%s:%s" % (seed, gamemode, page))
+    start_date = datetime.datetime(2021, 1, 1)
+    html = []
+    for index in range(page * page_size, min(matches, (page + 1) * page_size)):
+        date = start_date - datetime.timedelta(hours=12 * (index + 1), minutes=rnd.randint(0, 600))
+        html.append(make_match(rnd, gamemode, date, account_id))
+    pages = (matches + page_size - 1) // page_size
+    return {"success": True, "html": ''.join(html),
+            "continue_token": str(1000000 + page + 1) if page + 1 < pages else None}
+
+
+def page_index(continue_token):
+    return int(continue_token) - 1000000 if continue_token and str(continue_token) != '0' else 0
+
+
+def make_history(gamemode, matches, seed=0, account_id=ACCOUNT_ID, page_size=PAGE_SIZE):
+    return [make_page(gamemode, page, matches, seed, account_id, page_size)
+            for page in range((matches + page_size - 1) // page_size)]
+
+
+def load_fixtures(path=FIXTURES_DIR):
+    fixtures = []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.json'):
+                with open(os.path.join(path, name), 'r', encoding='utf8') as f:
+                    fixtures.append(json.load(f))
+    return fixtures
+
+
+def make_fixtures(pages=25, seed=0):
+    fixtures = []
+    for gamemode in ['competitive', 'wingman']:
+        for page in make_history(gamemode, pages * PAGE_SIZE, seed=seed):
+            fixtures.append({"gamemode": gamemode, "steamid": account_steamid(), "html": page["html"]})
+    return fixtures
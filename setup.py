@@ -8,4 +8,5 @@ setup(name='steam_csgo',
       author_email='andriy2033@gmail.com',
       license='MIT',
       packages=['steam_csgo'],
+      extras_require={'async': ['aiohttp'], 'analytics': ['numpy']},
       zip_safe=False)
\ No newline at end of file
@@ -7,5 +7,21 @@ import sys
 
 if sys.version_info[0] == 3:
     from .wrapper import *
+    from .metrics import MetricsRegistry
+    from .profile import Profile, ProfileBatch
+    from .records import MatchRecord, PlayerRecord, compact_games, expand_games
+    from .resolver import LinkCache, SteamIDResolver
+    from .scheduler import RateLimitScheduler, default_scheduler
+    from .sessions import FileSessionStore, SQLiteSessionStore
+    from .store import MatchStore
+    from .sync import SyncState
 else:
     pass
+
+
+def __getattr__(name):
+    # heavy modules (steam.webauth, crypto) are imported on first use only
+    if name == 'WebAuth':
+        from .webauth import WebAuth
+        return WebAuth
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
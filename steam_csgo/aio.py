@@ -0,0 +1,450 @@
+import asyncio
+import datetime
+import random
+import time
+from functools import partial
+from urllib.parse import urljoin
+
+import aiohttp
+from bs4 import BeautifulSoup as Bs
+from yarl import URL
+
+from .backfill import Backfill
+from .metrics import timed
+from .transport import RETRY_STATUSES, status_retries
+from .util import steam_misc
+from .webauth import WebAuth
+from .wrapper import BaseCSGOApi, CSGOApi
+
+
+class AsyncResponse(object):
+    def __init__(self, url, status_code, text):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+
+class AsyncWebAuth(object):
+    def __init__(self, concurrency=8, pool_size=32, timeout=15, cache=None, retries=5, backoff_factor=0.5,
+                 scheduler=None, metrics=None, transport=None):
+        # login goes through requests session with all transport options (adapter_class too),
+        # aiohttp session takes pool_maxsize, timeout and retry from them
+        transport = transport or {}
+        self.webauth = WebAuth(scheduler=scheduler, metrics=metrics, **transport)
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        retry = transport.get('retry')
+        if retry is not None:
+            self.retries = status_retries(retry)
+            self.backoff_factor = retry.backoff_factor
+        self.cache = cache
+        self.concurrency = concurrency
+        self.pool_size = transport.get('pool_maxsize', pool_size)
+        self.timeout = transport.get('timeout', timeout)
+        self.session = None
+        self._semaphore = None
+
+    @property
+    def session_id(self):
+        return self.webauth.session_id
+
+    @property
+    def steam_id(self):
+        return self.webauth.steam_id
+
+    @property
+    def logged_on(self):
+        return self.webauth.logged_on
+
+    @staticmethod
+    async def get_rsa(username):
+        return await asyncio.get_running_loop().run_in_executor(None, WebAuth.get_rsa, username)
+
+    async def get_rsa_key(self, username):
+        return await asyncio.get_running_loop().run_in_executor(None, self.webauth.get_rsa_key, username)
+
+    async def login_raw(self, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.webauth.login_raw, *args, **kwargs))
+
+    def export_session(self):
+        return self.webauth.export_session()
+
+    def restore_session(self, data):
+        self.webauth.restore_session(data)
+
+    async def check_session(self):
+        return await asyncio.get_running_loop().run_in_executor(None, self.webauth.check_session)
+
+    def open(self):
+        cookie_jar = aiohttp.CookieJar()
+        for cookie in self.webauth.session.cookies:
+            cookie_jar.update_cookies({cookie.name: cookie.value},
+                                      URL("https://%s/" % cookie.domain.lstrip('.')))
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            cookie_jar=cookie_jar,
+            headers=dict(self.webauth.session.headers),
+            timeout=aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+            if isinstance(self.timeout, tuple) else aiohttp.ClientTimeout(total=self.timeout))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def get_(self, url, use_cache=True, priority='default', **kwargs):
+        key = None
+        if self.cache is not None and use_cache:
+            key = self.cache.make_key(url, kwargs.get('params'))
+            resp = self.cache.get(key)
+            if resp is not None:
+                if self.metrics is not None:
+                    self.metrics.record_cache_hit(url)
+                return resp
+        if self.session is None:
+            self.open()
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            if self.scheduler is not None:
+                await self.scheduler.acquire_async(url, priority)
+            try:
+                async with self._semaphore:
+                    async with self.session.get(url, **kwargs) as resp:
+                        resp = AsyncResponse(str(resp.url), resp.status, await resp.text())
+                if self.scheduler is not None:
+                    self.scheduler.report(url, resp.status_code)
+                if resp.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    break
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt) * (1 + random.random()))
+        if self.metrics is not None:
+            self.metrics.record_response(url, resp, time.perf_counter() - start, attempt)
+        if key is not None and resp.ok:
+            self.cache.set(key, resp)
+        return resp
+
+    async def post_(self, url, **kwargs):
+        if self.session is None:
+            self.open()
+        async with self._semaphore:
+            async with self.session.post(url, **kwargs) as resp:
+                return AsyncResponse(str(resp.url), resp.status, await resp.text())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class AsyncCSGOApi(BaseCSGOApi):
+    def __init__(self, username, *args, _concurrency=8, _pool_size=32, **kwargs):
+        super().__init__(username, *args, **kwargs)
+        self.concurrency = _concurrency
+        self.pool_size = _pool_size
+
+    @staticmethod
+    async def check_steam_status(ttl=60):
+        return await asyncio.get_running_loop().run_in_executor(None, CSGOApi.check_steam_status, ttl)
+
+    async def login_in(self, username='', password='', timestamp='', captcha='', captcha_gid=-1,
+                       email_code='', steam_id='', twofactor_code='', language=None):
+        self.webclient = self.make_webclient()
+        return await self.webclient.login_raw(username, password, timestamp, captcha, captcha_gid,
+                                              email_code, steam_id, twofactor_code, language)
+
+    def make_webclient(self):
+        return AsyncWebAuth(self.concurrency, self.pool_size, cache=self.cache, scheduler=self.scheduler,
+                            metrics=self.metrics, transport=self.transport)
+
+    async def close(self):
+        if self.webclient is not None:
+            await self.webclient.close()
+
+    async def resume_session(self, store):
+        data = store.load(self.username)
+        if not data:
+            return False
+        self.webclient = self.make_webclient()
+        self.webclient.restore_session(data)
+        if not await self.webclient.check_session():
+            store.delete(self.username)
+            self.webclient = None
+            return False
+        self.comm_link = self.comm_link or data.get('comm_link')
+        self.api_key = self.api_key or data.get('api_key')
+        return True
+
+    async def main(self):
+        self.session_id = self.webclient.session_id
+        self.steamid = str(self.webclient.steam_id.as_64)
+        if not self.comm_link:
+            self.comm_link = (await self.webclient.get_(self.webclient.steam_id.community_url)).url
+        if self.comm_link[-1] != '/':
+            self.comm_link += '/'
+        elif '/home/' in self.comm_link:
+            self.comm_link = self.comm_link.replace('/home/', '/')
+        return tuple(await asyncio.gather(self._load_key_and_me_full(), self.load_all_games()))
+
+    async def _load_key_and_me_full(self):
+        if not self.api_key:
+            self.api_key = await self.get_api_key()
+        self.limited = not self.api_key
+        return await self.load_me_full()
+
+    async def get_html(self, url, params=None, use_cache=True):
+        if not use_cache:
+            return await self._fetch_html(url, params, False)
+        key = self.cache.make_key(url, params, 'html')
+        task = self.cache.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_html(url, params, True))
+            self.cache.set(key, task)
+        try:
+            return await task
+        except Exception:
+            self.cache.pop(key)
+            raise
+
+    async def _fetch_html(self, url, params, use_cache):
+        resp = await self.webclient.get_(url, use_cache=use_cache, priority='interactive', params=params)
+        if use_cache and not resp.ok:
+            self.cache.pop(self.cache.make_key(url, params, 'html'))
+        return Bs(resp.text, 'html.parser')
+
+    async def get_api_key(self, use_cache=True):
+        html = await self.get_html("https://steamcommunity.com/dev/apikey", use_cache=use_cache)
+        if html.find("div", {"id": "bodyContents_lo"}):
+            return None
+        if html.find("input", {"name": "Revoke"}) is not None:
+            return html.find("div", {"id": "bodyContents_ex"}).find_all("p")[0].text.strip().split(' ')[1]
+        else:
+            await self.webclient.post_("https://steamcommunity.com/dev/registerkey", data={
+                "domain": self.api_domain,
+                "agreeToTerms": "agreed",
+                "sessionid": self.session_id,
+                "Submit": "Register"
+            })
+            self.cache.invalidate("https://steamcommunity.com/dev/apikey")
+            return await self.get_api_key(use_cache=False)
+
+    @timed('load_all_games')
+    async def load_all_games(self):
+        games = await asyncio.gather(*[self.load_games(mode) for mode in self.gamemodes])
+        return dict(zip(self.gamemodes, games))
+
+    async def backfill_all_games(self, workers=None, max_in_flight=None):
+        with Backfill(self, workers, max_in_flight) as backfill:
+            return await backfill.load_all_games_async()
+
+    @timed('load_new_games')
+    async def load_new_games(self, gamemode, date=None):
+        return [game async for game in self.iter_games(gamemode, since=date)]
+
+    @timed('load_games')
+    async def load_games(self, gamemode, prefetch=False):
+        return [game async for game in self.iter_games(gamemode, prefetch=prefetch)]
+
+    async def iter_games(self, gamemode, since=None, prefetch=False):
+        loop = asyncio.get_running_loop()
+        pages = self.iter_pages(gamemode, prefetch=prefetch)
+        try:
+            async for match_dict in pages:
+                if prefetch:
+                    data = await loop.run_in_executor(None, self.parse_history_page, gamemode, match_dict["html"])
+                else:
+                    data = self.parse_history_page(gamemode, match_dict["html"])
+                seen = False
+                for game in data:
+                    if since is None or self.check_for_new(game["info"]["date"], since):
+                        yield game
+                    else:
+                        seen = True
+                if seen:
+                    return
+        finally:
+            await pages.aclose()
+
+    async def iter_pages(self, gamemode, continue_token=0, prefetch=False):
+        next_page = None
+        pages = 0
+        try:
+            while continue_token is not None:
+                if next_page is None:
+                    match_dict = await self.get_games_history(gamemode, self.session_id, continue_token)
+                else:
+                    match_dict, next_page = await next_page, None
+                if not match_dict or not match_dict.get("html"):
+                    return
+                continue_token = match_dict.get("continue_token")
+                if prefetch and continue_token is not None:
+                    next_page = asyncio.ensure_future(
+                        self.get_games_history(gamemode, self.session_id, continue_token))
+                pages += 1
+                yield match_dict
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+            if self.metrics is not None:
+                self.metrics.observe('history_walk_pages', pages, gamemode=gamemode)
+
+    async def sync_all_games(self, state):
+        games = await asyncio.gather(*[self.sync_games(mode, state) for mode in self.gamemodes])
+        return dict(zip(self.gamemodes, games))
+
+    async def sync_games(self, gamemode, state):
+        cursor = state.get(self.steamid, gamemode)
+        games = []
+        if cursor["date"]:
+            games = await self.sync_new_games(gamemode, state, cursor)
+        async for match_dict in self.iter_pages(gamemode, cursor["continue_token"]):
+            data = self.parse_history_page(gamemode, match_dict["html"])
+            if data and not cursor["date"]:
+                cursor["date"] = self.newest_game_date(data)
+            games.extend(data)
+            cursor["continue_token"] = match_dict.get("continue_token")
+            state.set(self.steamid, gamemode, cursor)
+        return games
+
+    async def sync_new_games(self, gamemode, state, cursor):
+        games = []
+        if cursor["head_token"] is not None:
+            if not await self.walk_new_games(gamemode, state, cursor, cursor["head_token"], games):
+                return games
+        await self.walk_new_games(gamemode, state, cursor, 0, games)
+        return games
+
+    async def walk_new_games(self, gamemode, state, cursor, continue_token, games):
+        pages = self.iter_pages(gamemode, continue_token)
+        try:
+            async for match_dict in pages:
+                if self.sync_new_page(gamemode, state, cursor, match_dict, games):
+                    return True
+        finally:
+            await pages.aclose()
+        return False
+
+    @timed('load_me_full')
+    async def load_me_full(self):
+        me, matchmaking_data, cooldown = await asyncio.gather(
+            self.load_me(), self.load_matchmaking_data(), self.load_cooldown_status())
+        return {"me": me, "matchmaking_data": matchmaking_data, "cooldown": cooldown}
+
+    @timed('load_me')
+    async def load_me(self):
+        steam_profile, ban_data = await asyncio.gather(self.get_html(self.comm_link), self.load_me_ban_status())
+        if steam_profile.find("div", {"class": "welcome_header_ctn"}):
+            return {}
+        return self.parse_me(steam_profile, ban_data)
+
+    @timed('load_matchmaking_data')
+    async def load_matchmaking_data(self):
+        return self.parse_matchmaking_data(await self.get_html(urljoin(self.comm_link, 'gcpd/730/'),
+                                                               params=dict(tab='matchmaking')))
+
+    @timed('load_me_ban_status')
+    async def load_me_ban_status(self):
+        if not self.limited:
+            return self.parse_player_ban(await self.get_player_ban_status(self.steamid))
+        else:
+            return {'banned': None, 'VAC': None, 'overwatch': None}
+
+    @timed('load_cooldown_status')
+    async def load_cooldown_status(self):
+        return self.parse_cooldown_status(await self.get_html(urljoin(self.comm_link, 'gcpd/730/'),
+                                                              params=dict(tab='matchmaking')))
+
+    async def get_player_steamid(self, community_links):
+        if isinstance(community_links, list):
+            return await self.resolver.resolve_async(community_links)
+        steamid = (await self.resolver.resolve_async([community_links]))[0]
+        return str(steamid) if steamid is not None else None
+
+    async def get_steam_profile_info(self, steamids):
+        players = self.extract_json((await self.webclient.get_(
+            urljoin(steam_misc['api'], "ISteamUser/GetPlayerSummaries/v2/"), use_cache=not isinstance(steamids, list),
+            params=dict(key=self.api_key, steamids=",".join(steamids) if isinstance(steamids, list) else steamids)
+        )).text)['response']['players']
+        return players if isinstance(steamids, list) else players[0]
+
+    async def get_player_ban_status(self, steamids):
+        players = self.extract_json((await self.webclient.get_(
+            urljoin(steam_misc['api'], "ISteamUser/GetPlayerBans/v1/"), use_cache=not isinstance(steamids, list),
+            params=dict(key=self.api_key, steamids=",".join(steamids) if isinstance(steamids, list) else steamids)
+        )).text)['players']
+        return players if isinstance(steamids, list) else players[0]
+
+    @timed('get_player_bans')
+    async def get_player_bans(self, steamids, use_cache=True):
+        bans, missing = self.split_cached_bans(steamids, use_cache)
+        chunks = await asyncio.gather(*[self.get_player_ban_status(missing[i:i + self.ban_chunk_size])
+                                        for i in range(0, len(missing), self.ban_chunk_size)])
+        for chunk in chunks:
+            for player in chunk:
+                self.ban_cache.set(player['SteamId'], player)
+                bans[player['SteamId']] = player
+        return bans
+
+    async def get_games_history(self, gamemode, session_id, continue_token):
+        gamemode = 'matchhistorycompetitive' if gamemode == self.gamemodes[0] else 'matchhistorywingman'
+        try:
+            resp = await self.webclient.get_(urljoin(self.comm_link, 'gcpd/730/'), use_cache=False,
+                                             priority='background',
+                                             params=dict(ajax=1, tab=gamemode,
+                                                         continue_token=continue_token,
+                                                         sessionid=session_id))
+            return self.extract_json(resp.text)
+        except ValueError:
+            pass
+        return None
+
+    async def get_game_cheats_stat(self, game):
+        return (await self.get_games_cheats_stat([game]))[0]
+
+    @timed('get_games_cheats_stat')
+    async def get_games_cheats_stat(self, games):
+        if self.limited:
+            return [[] for _ in games]
+        bans = await self.get_player_bans([p['steamid'] for game in games for p in self.get_game_players(game)])
+        return self.parse_games_cheats_stat(games, bans)
+
+    async def cli_login_in(self, password):
+        self.webclient = self.make_webclient()
+        rsa = await self.webclient.get_rsa_key(self.username)
+        await self.webclient.login_raw(self.username, self.encrypt_password(rsa, password), rsa['timestamp'])
+
+    async def cli_main(self):
+        self.session_id = self.webclient.session_id
+        self.steamid = str(self.webclient.steam_id.as_64)
+        if not self.comm_link:
+            self.comm_link = (await self.webclient.get_(self.webclient.steam_id.community_url)).url
+        if self.comm_link[-1] != '/':
+            self.comm_link += '/'
+        elif '/home/' in self.comm_link:
+            self.comm_link = self.comm_link.replace("/home/", "/")
+        print("Steam ID: " + self.steamid)
+        print("Link: " + self.comm_link)
+        if not self.api_key:
+            self.api_key = await self.get_api_key()
+        if self.api_key:
+            self.limited = False
+            print(self.api_key)
+        else:
+            self.limited = True
+            print("Limited account")
+        print("Program start time: " + str(datetime.datetime.now().time()))
+        games, me = await asyncio.gather(self.load_all_games(), self.load_me_full())
+        if self.metrics is not None:
+            print(self.metrics.to_prometheus())
+        return (me, games)
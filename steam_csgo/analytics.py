@@ -0,0 +1,158 @@
+import numpy as np
+
+from .records import MatchRecord
+
+STAT_FIELDS = ['kills', 'assists', 'deaths', 'mvps', 'hs_percent', 'score', 'ping']
+
+
+def stat_value(value):
+    return value if isinstance(value, int) else np.nan
+
+
+def rolling_mean(values, window):
+    if len(values) < window:
+        return np.empty(0)
+    cumsum = np.cumsum(np.insert(values, 0, 0.0))
+    return (cumsum[window:] - cumsum[:-window]) / window
+
+
+class MatchTable(object):
+    def __init__(self, columns, maps, gamemodes):
+        self.columns = columns
+        self.maps = maps
+        self.gamemodes = gamemodes
+        self.result = np.sign(columns['rounds_won'] - columns['rounds_lost'])
+        self.me = columns['me']
+
+    def __len__(self):
+        return len(self.result)
+
+    @classmethod
+    def from_games(cls, games, steamid):
+        if isinstance(games, dict):
+            games = [game for mode_games in games.values() for game in mode_games]
+        steamid = int(steamid)
+        maps = {}
+        gamemodes = {}
+        rows = {name: [] for name in ['match', 'timestamp', 'gamemode', 'map', 'team', 'steamid', 'me',
+                                      'rounds_won', 'rounds_lost'] + STAT_FIELDS}
+        for index, game in enumerate(games):
+            if not isinstance(game, MatchRecord):
+                game = MatchRecord.from_dict(game)
+            map_code = maps.setdefault(game.map, len(maps))
+            gamemode_code = gamemodes.setdefault(game.gamemode, len(gamemodes))
+            for team, players in enumerate(game.teams):
+                rounds_won, rounds_lost = game.score if team == 0 else game.score[::-1]
+                for player in players:
+                    rows['match'].append(index)
+                    rows['timestamp'].append(game.timestamp)
+                    rows['gamemode'].append(gamemode_code)
+                    rows['map'].append(map_code)
+                    rows['team'].append(team)
+                    rows['steamid'].append(player.steamid)
+                    rows['me'].append(player.steamid == steamid)
+                    rows['rounds_won'].append(rounds_won)
+                    rows['rounds_lost'].append(rounds_lost)
+                    for name in STAT_FIELDS:
+                        rows[name].append(stat_value(getattr(player, name)))
+        columns = {
+            'match': np.array(rows['match'], dtype=np.int32),
+            'timestamp': np.array(rows['timestamp'], dtype=np.int64),
+            'gamemode': np.array(rows['gamemode'], dtype=np.int16),
+            'map': np.array(rows['map'], dtype=np.int16),
+            'team': np.array(rows['team'], dtype=np.int8),
+            'steamid': np.array(rows['steamid'], dtype=np.int64),
+            'me': np.array(rows['me'], dtype=bool),
+            'rounds_won': np.array(rows['rounds_won'], dtype=np.int16),
+            'rounds_lost': np.array(rows['rounds_lost'], dtype=np.int16),
+        }
+        for name in STAT_FIELDS:
+            columns[name] = np.array(rows[name], dtype=np.float64)
+        return cls(columns, list(maps), list(gamemodes))
+
+    def group_names(self, by):
+        return self.maps if by == 'map' else self.gamemodes
+
+    def win_rate(self, by='map'):
+        names = self.group_names(by)
+        codes = self.columns[by][self.me]
+        result = self.result[self.me]
+        matches = np.bincount(codes, minlength=len(names))
+        wins = np.bincount(codes, weights=result == 1, minlength=len(names))
+        draws = np.bincount(codes, weights=result == 0, minlength=len(names))
+        stats = {}
+        for i in np.flatnonzero(matches):
+            stats[names[i]] = {'matches': int(matches[i]), 'wins': int(wins[i]), 'draws': int(draws[i]),
+                               'losses': int(matches[i] - wins[i] - draws[i]),
+                               'win_rate': float(wins[i] / matches[i])}
+        return stats
+
+    def ratios(self, by=None):
+        if by is None:
+            codes = np.zeros(int(self.me.sum()), dtype=np.int16)
+            names = ['all']
+        else:
+            codes = self.columns[by][self.me]
+            names = self.group_names(by)
+        sums = {}
+        for name in ['kills', 'assists', 'deaths', 'mvps', 'score']:
+            sums[name] = np.bincount(codes, weights=np.nan_to_num(self.columns[name][self.me]), minlength=len(names))
+        rounds = self.columns['rounds_won'][self.me] + self.columns['rounds_lost'][self.me]
+        sums['rounds'] = np.bincount(codes, weights=rounds, minlength=len(names))
+        hs = self.columns['hs_percent'][self.me]
+        known_hs = ~np.isnan(hs)
+        hs_sum = np.bincount(codes[known_hs], weights=hs[known_hs], minlength=len(names))
+        hs_count = np.bincount(codes[known_hs], minlength=len(names))
+        matches = np.bincount(codes, minlength=len(names))
+        deaths = np.maximum(sums['deaths'], 1)
+        rounds = np.maximum(sums['rounds'], 1)
+        stats = {}
+        for i in np.flatnonzero(matches):
+            stats[names[i]] = {
+                'matches': int(matches[i]),
+                'kd': float(sums['kills'][i] / deaths[i]),
+                'kda': float((sums['kills'][i] + sums['assists'][i]) / deaths[i]),
+                'kills_per_round': float(sums['kills'][i] / rounds[i]),
+                'deaths_per_round': float(sums['deaths'][i] / rounds[i]),
+                'assists_per_round': float(sums['assists'][i] / rounds[i]),
+                'mvps_per_match': float(sums['mvps'][i] / matches[i]),
+                'score_per_round': float(sums['score'][i] / rounds[i]),
+                'hs_percent': float(hs_sum[i] / hs_count[i]) if hs_count[i] else None,
+            }
+        return stats
+
+    def hs_distribution(self, bins=10):
+        hs = self.columns['hs_percent'][self.me]
+        hs = hs[~np.isnan(hs)]
+        counts, edges = np.histogram(hs, bins=bins, range=(0, 100))
+        return {'counts': counts, 'edges': edges,
+                'mean': float(hs.mean()) if len(hs) else None,
+                'median': float(np.median(hs)) if len(hs) else None}
+
+    def rolling_form(self, window=10):
+        order = np.argsort(self.columns['timestamp'][self.me], kind='stable')
+        result = self.result[self.me][order]
+        kills = np.nan_to_num(self.columns['kills'][self.me][order])
+        deaths = np.maximum(np.nan_to_num(self.columns['deaths'][self.me][order]), 1)
+        return {'timestamp': self.columns['timestamp'][self.me][order][window - 1:],
+                'win_rate': rolling_mean((result == 1).astype(np.float64), window),
+                'kd': rolling_mean(kills / deaths, window)}
+
+    def teammates(self, min_matches=1):
+        my_team = np.full(int(self.columns['match'].max()) + 1 if len(self) else 0, -1, dtype=np.int8)
+        my_team[self.columns['match'][self.me]] = self.columns['team'][self.me]
+        mates = ~self.me & (self.columns['team'] == my_team[self.columns['match']])
+        steamids, inverse = np.unique(self.columns['steamid'][mates], return_inverse=True)
+        matches = np.bincount(inverse, minlength=len(steamids))
+        wins = np.bincount(inverse, weights=self.result[mates] == 1, minlength=len(steamids))
+        keep = np.flatnonzero(matches >= min_matches)
+        win_rate = wins[keep] / matches[keep]
+        order = keep[np.lexsort((-matches[keep], -win_rate))]
+        return [{'steamid': str(steamids[i]), 'matches': int(matches[i]), 'wins': int(wins[i]),
+                 'win_rate': float(wins[i] / matches[i])} for i in order]
+
+    def best_teammates(self, count=5, min_matches=3):
+        return self.teammates(min_matches)[:count]
+
+    def worst_teammates(self, count=5, min_matches=3):
+        return self.teammates(min_matches)[::-1][:count]
@@ -0,0 +1,118 @@
+import os
+from collections import deque
+
+from .lazy import LazyModule
+
+asyncio = LazyModule('asyncio')
+futures = LazyModule('concurrent.futures')
+multiprocessing = LazyModule('multiprocessing')
+
+_worker_api = None
+
+
+def init_worker(parser):
+    global _worker_api
+    from .wrapper import CSGOApi
+    _worker_api = CSGOApi('backfill', _parser=parser, _scheduler=None)
+
+
+def parse_page(steamid, gamemode, html):
+    _worker_api.steamid = steamid
+    return _worker_api.parse_games(gamemode, html)
+
+
+class Backfill(object):
+    def __init__(self, api, workers=None, max_in_flight=None, prefetch=2):
+        self.api = api
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.prefetch = prefetch
+        self.executor = None
+
+    def open(self):
+        if self.executor is None:
+            # workers start lazily while prefetch thread holds locks, so they must not be forked
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self.executor = futures.ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(method),
+                                                        initializer=init_worker, initargs=(self.api.parser,))
+        return self.executor
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def iter_parsed_pages(self, gamemode, continue_token=0):
+        executor = self.open()
+        in_flight = deque()
+        try:
+            for match_dict in self.api.iter_pages(gamemode, continue_token, prefetch=self.prefetch):
+                if len(in_flight) >= self.max_in_flight:
+                    yield self.collect(in_flight.popleft())
+                in_flight.append(executor.submit(parse_page, self.api.steamid, gamemode, match_dict["html"]))
+            while in_flight:
+                yield self.collect(in_flight.popleft())
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    async def iter_parsed_pages_async(self, gamemode, continue_token=0):
+        # AsyncCSGOApi fetches pages on the event loop, parsing waits for the same process pool
+        executor = self.open()
+        loop = asyncio.get_running_loop()
+        in_flight = deque()
+        pages = self.api.iter_pages(gamemode, continue_token, prefetch=bool(self.prefetch))
+        try:
+            async for match_dict in pages:
+                if len(in_flight) >= self.max_in_flight:
+                    yield self.add_links(await in_flight.popleft())
+                in_flight.append(loop.run_in_executor(executor, parse_page, self.api.steamid, gamemode,
+                                                      match_dict["html"]))
+            while in_flight:
+                yield self.add_links(await in_flight.popleft())
+        finally:
+            await pages.aclose()
+            for future in in_flight:
+                future.cancel()
+
+    def collect(self, future):
+        return self.add_links(future.result())
+
+    def add_links(self, games):
+        # vanity links parsed in workers fill their own caches, so parent one is filled here
+        self.api.resolver.cache.add_games(games)
+        return games
+
+    def iter_games(self, gamemode, continue_token=0):
+        for games in self.iter_parsed_pages(gamemode, continue_token):
+            yield from games
+
+    def load_games(self, gamemode):
+        return list(self.iter_games(gamemode))
+
+    def load_all_games(self):
+        csgo_games = {}
+        for mode in self.api.gamemodes:
+            csgo_games[mode] = self.load_games(mode)
+        return csgo_games
+
+    async def iter_games_async(self, gamemode, continue_token=0):
+        async for games in self.iter_parsed_pages_async(gamemode, continue_token):
+            for game in games:
+                yield game
+
+    async def load_games_async(self, gamemode):
+        return [game async for game in self.iter_games_async(gamemode)]
+
+    async def load_all_games_async(self):
+        csgo_games = {}
+        for mode in self.api.gamemodes:
+            csgo_games[mode] = await self.load_games_async(mode)
+        return csgo_games
@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .lazy import LazyModule
+from .sessions import FileSessionStore
+from .wrapper import CSGOApi
+
+requests = LazyModule('requests')
+steam_webauth = LazyModule('steam.webauth')
+
+
+def load_accounts(path):
+    accounts = []
+    with open(path, 'r', encoding='utf8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                accounts.append(json.loads(line))
+            else:
+                username, _, password = line.partition(':')
+                accounts.append({'username': username, 'password': password})
+    return accounts
+
+
+def is_retryable(error):
+    # wrong password, captcha and steam guard codes fail the same way again, only transport and server errors may pass
+    if isinstance(error, steam_webauth.WebAuthException):
+        return isinstance(error, steam_webauth.HTTPError)
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, requests.exceptions.RequestException)
+
+
+class Checkpoint(object):
+    def __init__(self, path=None):
+        self.path = path
+        self.done = set()
+        if self.path and os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf8') as f:
+                self.done = set(json.load(f)['done'])
+        self._lock = threading.Lock()
+
+    def __contains__(self, username):
+        return username in self.done
+
+    def add(self, username):
+        with self._lock:
+            self.done.add(username)
+            self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf8') as f:
+            json.dump({'done': sorted(self.done)}, f)
+        os.replace(tmp_path, self.path)
+
+
+class BatchRunner(object):
+    def __init__(self, accounts, output, workers=4, checkpoint=None, session_store=None, retries=1, api_kwargs=None,
+                 api_class=CSGOApi):
+        self.accounts = accounts
+        self.output = output
+        self.workers = workers
+        self.checkpoint = checkpoint if checkpoint is not None else Checkpoint()
+        self.session_store = session_store
+        self.retries = retries
+        self.api_kwargs = api_kwargs or {}
+        self.api_class = api_class
+        self._lock = threading.Lock()
+
+    def pending(self):
+        return [account for account in self.accounts if account['username'] not in self.checkpoint]
+
+    def load_account(self, account):
+        api = self.api_class(account['username'], _api_key=account.get('api_key'), **self.api_kwargs)
+        if self.session_store is None or not api.resume_session(self.session_store):
+            api.cli_login_in(account['password'])
+        me, games = api.main()
+        if self.session_store is not None:
+            # saved after main() so community link and api key are stored too
+            api.save_session(self.session_store)
+        return {'username': account['username'], 'steamid': api.steamid, 'me': me, 'games': games}
+
+    def process(self, account):
+        start = time.monotonic()
+        for attempt in range(self.retries + 1):
+            try:
+                result = self.load_account(account)
+                break
+            except Exception as e:
+                if attempt == self.retries or not is_retryable(e):
+                    result = {'username': account['username'], 'error': "%s: %s" % (type(e).__name__, e)}
+                    break
+        result['elapsed'] = time.monotonic() - start
+        return result
+
+    def write(self, result):
+        with self._lock:
+            self.output.write(json.dumps(result) + '\n')
+            self.output.flush()
+            if 'error' not in result:
+                self.checkpoint.add(result['username'])
+
+    def run(self):
+        done = failed = 0
+        with ThreadPoolExecutor(self.workers) as executor:
+            for future in as_completed([executor.submit(self.process, account) for account in self.pending()]):
+                result = future.result()
+                self.write(result)
+                if 'error' in result:
+                    failed += 1
+                else:
+                    done += 1
+        return {'done': done, 'failed': failed, 'skipped': len(self.accounts) - done - failed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load profiles and match history of many accounts into JSON Lines")
+    parser.add_argument('accounts', help="file with username:password lines or JSON lines "
+                                         "({\"username\": ..., \"password\": ..., \"api_key\": ...})")
+    parser.add_argument('-o', '--output', default='-', help="JSON Lines output file (appended), - for stdout")
+    parser.add_argument('-w', '--workers', type=int, default=4)
+    parser.add_argument('-c', '--checkpoint', help="file with finished accounts, they are skipped on next run")
+    parser.add_argument('-s', '--sessions', help="directory to keep logged-in sessions in")
+    parser.add_argument('-r', '--retries', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'a', encoding='utf8')
+    try:
+        runner = BatchRunner(load_accounts(args.accounts), output, args.workers, Checkpoint(args.checkpoint),
+                             FileSessionStore(args.sessions) if args.sessions else None, args.retries)
+        stats = runner.run()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print("done: %(done)d, failed: %(failed)d, skipped: %(skipped)d" % stats, file=sys.stderr)
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import time
+from collections import OrderedDict
+from threading import RLock
+
+
+class ResponseCache(object):
+    def __init__(self, maxsize=128, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    @staticmethod
+    def make_key(url, params=None, kind='response'):
+        if params:
+            params = tuple(sorted((str(k), str(v)) for k, v in params.items()))
+        return (kind, url, params or ())
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expire, value = item
+            if expire is not None and expire < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=-1):
+        # ttl=None keeps entry until it is evicted, ttl=0 disables caching, -1 is cache default
+        ttl = self.ttl if ttl == -1 else ttl
+        with self._lock:
+            if ttl is not None and ttl <= 0:
+                self._data.pop(key, None)
+                return
+            self._data[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+
+    def invalidate(self, url=None, params=None):
+        with self._lock:
+            if url is None:
+                self._data.clear()
+                return
+            params = self.make_key(url, params)[2] if params is not None else None
+            for key in list(self._data):
+                if key[1] == url and (params is None or key[2] == params):
+                    del self._data[key]
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,23 @@
+import importlib
+import threading
+
+_lock = threading.Lock()
+
+
+class LazyModule(object):
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def __repr__(self):
+        return "<LazyModule %s%s>" % (self._name, '' if self._module is None else ' (loaded)')
+
+    def load(self):
+        module = self._module
+        if module is None:
+            with _lock:
+                module = self.__dict__['_module'] = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
@@ -0,0 +1,140 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+def label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def format_labels(key):
+    if not key:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, value.replace('\\', '\\\\').replace('"', '\\"'))
+                             for name, value in key)
+
+
+class MetricsRegistry(object):
+    def __init__(self, prefix='steam_csgo_'):
+        self.prefix = prefix
+        self.counters = {}
+        self.summaries = {}
+        self.listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+        return callback
+
+    def remove_listener(self, callback):
+        self.listeners.remove(callback)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        for callback in self.listeners:
+            callback(name, value, labels)
+
+    def observe(self, name, value, **labels):
+        key = (name, label_key(labels))
+        with self._lock:
+            summary = self.summaries.get(key)
+            if summary is None:
+                self.summaries[key] = [1, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                if value > summary[2]:
+                    summary[2] = value
+        for callback in self.listeners:
+            callback(name, value, labels)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def record_response(self, url, resp, elapsed, retries=0):
+        host = urlsplit(url).hostname or url
+        self.observe('http_request_seconds', elapsed, host=host)
+        self.inc('http_requests_total', host=host, status=resp.status_code)
+        self.observe('http_response_bytes', len(resp.content) if hasattr(resp, 'content') else len(resp.text),
+                     host=host)
+        if retries:
+            self.inc('http_retries_total', retries, host=host)
+
+    def record_cache_hit(self, url):
+        self.inc('http_cache_hits_total', host=urlsplit(url).hostname or url)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.summaries.clear()
+
+    def snapshot(self):
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            summaries = [{'name': name, 'labels': dict(labels), 'count': count, 'sum': total, 'max': maximum,
+                          'avg': total / count}
+                         for (name, labels), (count, total, maximum) in sorted(self.summaries.items())]
+        return {'counters': counters, 'summaries': summaries}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            summaries = sorted(self.summaries.items())
+        typed = set()
+        for (name, labels), value in counters:
+            name = self.prefix + name
+            if name not in typed:
+                typed.add(name)
+                lines.append('# TYPE %s counter' % name)
+            lines.append('%s%s %s' % (name, format_labels(labels), value))
+        for (name, labels), (count, total, maximum) in summaries:
+            name = self.prefix + name
+            if name not in typed:
+                typed.add(name)
+                lines.append('# TYPE %s summary' % name)
+            lines.append('%s_count%s %d' % (name, format_labels(labels), count))
+            lines.append('%s_sum%s %r' % (name, format_labels(labels), float(total)))
+        for (name, labels), (count, total, maximum) in summaries:
+            name = self.prefix + name + '_max'
+            if name not in typed:
+                typed.add(name)
+                lines.append('# TYPE %s gauge' % name)
+            lines.append('%s%s %r' % (name, format_labels(labels), float(maximum)))
+        return '\n'.join(lines) + '\n'
+
+
+def timed(name):
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                if self.metrics is None:
+                    return await func(self, *args, **kwargs)
+                with self.metrics.timer('call_seconds', function=name):
+                    return await func(self, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if self.metrics is None:
+                return func(self, *args, **kwargs)
+            with self.metrics.timer('call_seconds', function=name):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
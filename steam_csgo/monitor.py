@@ -0,0 +1,98 @@
+import math
+import threading
+import time
+
+from .lazy import LazyModule
+from .records import DATE_FORMAT
+
+asyncio = LazyModule('asyncio')
+
+
+class BanMonitor(object):
+    def __init__(self, api, store, interval=86400, every=600, recent=30 * 86400, stale_factor=4, batch_size=100):
+        self.api = api
+        self.store = store
+        self.interval = interval
+        self.every = every
+        self.recent = recent
+        self.stale_factor = stale_factor
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+
+    def candidates(self, now=None):
+        now = int(now or time.time())
+        # players seen within `recent` are checked every interval, older ones stale_factor times less often
+        period = "CASE WHEN ? - coalesce(p.last_seen, 0) < ? THEN ? ELSE ? END"
+        params = (now, self.recent, self.interval, self.interval * self.stale_factor)
+        players = ("FROM players p LEFT JOIN bans b ON b.steamid = p.steamid "
+                   "WHERE p.steamid NOT IN (SELECT DISTINCT account FROM matches)")
+        weight = self.store.query("SELECT coalesce(sum(%d.0 / %s), 0) AS weight %s" % (self.interval, period, players),
+                                  params)[0]['weight']
+        budget = max(self.batch_size, int(math.ceil(weight * self.every / self.interval)))
+        return self.store.query(
+            "SELECT * FROM (SELECT p.steamid, p.player_name, p.last_seen, b.checked, b.vac_banned, b.vac_bans, "
+            "b.game_bans, coalesce(b.checked, 0) + %s AS due_at %s) WHERE due_at <= ? ORDER BY due_at LIMIT ?"
+            % (period, players), params + (now, budget))
+
+    def chunks(self, rows):
+        steamids = [str(row['steamid']) for row in rows]
+        return [steamids[i:i + self.batch_size] for i in range(0, len(steamids), self.batch_size)]
+
+    def step(self, now=None):
+        rows = self.candidates(now)
+        bans = [player for chunk in self.chunks(rows) for player in self.api.get_player_ban_status(chunk)]
+        return self.record(rows, bans, now)
+
+    async def step_async(self, now=None):
+        # for AsyncCSGOApi, ban statuses are awaited and the store is updated on the event loop thread
+        rows = self.candidates(now)
+        bans = [player for chunk in self.chunks(rows) for player in await self.api.get_player_ban_status(chunk)]
+        return self.record(rows, bans, now)
+
+    def record(self, rows, bans, now=None):
+        if not rows:
+            return []
+        known = {str(row['steamid']): row for row in rows}
+        bans = {player['SteamId']: player for player in bans}
+        self.store.add_bans(bans, now)
+        return [change for change in (self.diff(known[steamid], ban) for steamid, ban in bans.items()
+                                      if steamid in known) if change]
+
+    def diff(self, row, ban):
+        if row['checked'] is None:
+            return None
+        new_vac = ban['NumberOfVACBans'] - row['vac_bans']
+        new_game = ban['NumberOfGameBans'] - row['game_bans']
+        if new_vac <= 0 and new_game <= 0 and not (ban['VACBanned'] and not row['vac_banned']):
+            return None
+        last_seen = time.strftime(DATE_FORMAT, time.gmtime(row['last_seen']))
+        return {**{'steamid': ban['SteamId'], 'player_name': row['player_name'], 'last_seen': last_seen,
+                   'new_VAC': max(new_vac, 0), 'new_ov': max(new_game, 0)},
+                **self.api.parse_player_ban(ban, last_seen)}
+
+    def run(self, callback, steps=None):
+        self._stop.clear()
+        step = 0
+        while not self._stop.is_set():
+            start = time.monotonic()
+            for change in self.step():
+                callback(change)
+            step += 1
+            if steps is not None and step >= steps:
+                return
+            self._stop.wait(max(0.0, self.every - (time.monotonic() - start)))
+
+    async def run_async(self, callback, steps=None):
+        self._stop.clear()
+        step = 0
+        while not self._stop.is_set():
+            start = time.monotonic()
+            for change in await self.step_async():
+                callback(change)
+            step += 1
+            if steps is not None and step >= steps:
+                return
+            await asyncio.sleep(max(0.0, self.every - (time.monotonic() - start)))
+
+    def stop(self):
+        self._stop.set()
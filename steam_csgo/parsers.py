@@ -0,0 +1,100 @@
+from html.parser import HTMLParser
+
+
+class ScoreboardExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.games = []
+        self._game = None
+        self._tables = []
+        self._row = None
+        self._cell = None
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            if self._tables:
+                self._row = {'text': [], 'cells': []}
+                self._tables[-1].append(self._row)
+            else:
+                self._game = []
+        elif tag == 'table':
+            if self._game is not None:
+                self._tables.append([])
+                self._game.append(self._tables[-1])
+        elif self._row is None:
+            return
+        elif tag == 'td':
+            self._cell = {'text': [], 'classes': (dict(attrs).get('class') or '').split(),
+                          'href': None, 'link': None, 'img': None}
+            self._row['cells'].append(self._cell)
+        elif self._cell is None:
+            return
+        elif tag == 'a':
+            attrs = dict(attrs)
+            if self._cell['href'] is None:
+                self._cell['href'] = attrs.get('href')
+            if self._cell['link'] is None and 'linkTitle' in (attrs.get('class') or '').split():
+                self._link = self._cell['link'] = (attrs.get('href'), [])
+        elif tag == 'img':
+            if self._cell['img'] is None:
+                self._cell['img'] = dict(attrs)
+
+    def handle_endtag(self, tag):
+        if tag == 'tr':
+            if self._tables:
+                self._row = self._cell = self._link = None
+            elif self._game is not None:
+                if self._game:
+                    self.games.append(self._game)
+                self._game = None
+        elif tag == 'table':
+            if self._tables:
+                self._tables.pop()
+                self._row = self._cell = self._link = None
+        elif tag == 'td':
+            self._cell = self._link = None
+        elif tag == 'a':
+            self._link = None
+
+    def handle_data(self, data):
+        if self._row is not None:
+            self._row['text'].append(data)
+            if self._cell is not None:
+                self._cell['text'].append(data)
+                if self._link is not None:
+                    self._link[1].append(data)
+
+
+def parse_games_stream(api, gamemode, html):
+    extractor = ScoreboardExtractor()
+    extractor.feed(html.strip())
+    extractor.close()
+    player_counts = 5 if gamemode == api.gamemodes[0] else 2
+    games_set = []
+    for tables in extractor.games:
+        info_rows, leaderboard = tables[0], tables[1]
+        replay = None
+        for row in info_rows:
+            for cell in row['cells']:
+                if replay is None and 'csgo_scoreboard_cell_noborder' in cell['classes']:
+                    replay = cell['href']
+        game_info = api.make_game_info([''.join(row['text']) for row in info_rows], replay)
+        teams = []
+        for i in range(len(api.team_names)):
+            team = []
+            for j in range(player_counts):
+                cells = leaderboard[(i * (player_counts + 1)) + 1 + j]['cells']
+                href, name = cells[0]['link']
+                icon = cells[0]['img']
+                team.append(api.make_player_stat(''.join(name), href, icon['data-miniprofile'], icon['src'],
+                                                 [''.join(cell['text']) for cell in cells]))
+            teams.append(team)
+        score = ''.join(leaderboard[player_counts + 1]['cells'][0]['text'])
+        games_set.append({"info": game_info, "stat": api.make_game_stat(score, teams)})
+    return games_set
+
+
+parser_backends = {
+    'stream': parse_games_stream,
+}
@@ -0,0 +1,121 @@
+import re
+
+from .records import PROFILE_LINK
+
+SUMMARY_FIELDS = {'name': 'personaname', 'realname': 'realname', 'country': 'loccountrycode', 'icon': 'avatarfull'}
+PROFILE_FIELDS = ['banned', 'VAC', 'overwatch', 'name', 'realname', 'country', 'icon', 'level', 'status']
+
+
+class ProfileBatch(object):
+    def __init__(self, api, steamids, chunk_size=100):
+        self.api = api
+        self.steamids = [str(steamid) for steamid in steamids]
+        self.chunk_size = chunk_size
+        self.summaries = None
+        self.bans = None
+
+    def summary(self, steamid):
+        if self.summaries is None:
+            self.summaries = {}
+            if self.api.api_key:
+                for i in range(0, len(self.steamids), self.chunk_size):
+                    for player in self.api.get_steam_profile_info(self.steamids[i:i + self.chunk_size]):
+                        self.summaries[player['steamid']] = player
+        return self.summaries.get(steamid)
+
+    def ban(self, steamid):
+        if self.bans is None:
+            self.bans = self.api.get_player_bans(self.steamids) if not self.api.limited else {}
+        ban = self.bans.get(steamid)
+        if ban is None:
+            return {'banned': None, 'VAC': None, 'overwatch': None}
+        return self.api.parse_player_ban(ban)
+
+
+class Profile(object):
+    def __init__(self, api, steamid, batch=None, profile_link=None):
+        self.api = api
+        self.steamid = str(steamid)
+        self.batch = batch or ProfileBatch(api, [self.steamid])
+        self._profile_link = profile_link
+        self._html = None
+        self._values = {}
+
+    def __repr__(self):
+        return "<Profile %s>" % self.steamid
+
+    @property
+    def summary(self):
+        return self.batch.summary(self.steamid)
+
+    @property
+    def profile_link(self):
+        if self._profile_link is None:
+            summary = self.summary
+            self._profile_link = summary['profileurl'] if summary else PROFILE_LINK % int(self.steamid) + '/'
+        return self._profile_link
+
+    @property
+    def html(self):
+        if self._html is None:
+            self._html = self.api.get_html(self.profile_link)
+        return self._html
+
+    def field(self, name):
+        if name not in self._values:
+            summary = self.summary
+            if name in SUMMARY_FIELDS and summary is not None:
+                # fields missing in summary are private, profile page doesn't show them either
+                value = summary.get(SUMMARY_FIELDS[name]) or None
+                self._values[name] = value.lower() if name == 'country' and value else value
+            elif name in ('banned', 'VAC', 'overwatch'):
+                self._values.update((key, value) for key, value in self.batch.ban(self.steamid).items()
+                                    if key in ('banned', 'VAC', 'overwatch'))
+            else:
+                self._values[name] = self.parse_html_field(name)
+        return self._values[name]
+
+    def parse_html_field(self, name):
+        html = self.html
+        if name == 'name':
+            return html.find('span', {'class': 'actual_persona_name'}).text.strip()
+        if name in ('realname', 'country'):
+            real_name = html.find('div', {'class': 'header_real_name ellipsis'})
+            if real_name is None:
+                return None
+            if name == 'realname':
+                return real_name.find('bdi').text.strip()
+            flag = real_name.find('img')
+            return re.findall(r'(\w+)', flag['src'])[-2] if flag else None
+        if name == 'icon':
+            return html.find('div', {'class': 'playerAvatarAutoSizeInner'}).find('img')['src']
+        if name == 'level':
+            level = html.find('span', {'class': 'friendPlayerLevelNum'})
+            return level.text.strip() if level else None
+        if name == 'status':
+            avatar = html.find('div', {'class': 'playerAvatar'})
+            return avatar['class'][-1] if avatar else None
+        raise KeyError(name)
+
+    banned = property(lambda self: self.field('banned'))
+    VAC = property(lambda self: self.field('VAC'))
+    overwatch = property(lambda self: self.field('overwatch'))
+    name = property(lambda self: self.field('name'))
+    realname = property(lambda self: self.field('realname'))
+    country = property(lambda self: self.field('country'))
+    icon = property(lambda self: self.field('icon'))
+    level = property(lambda self: self.field('level'))
+    status = property(lambda self: self.field('status'))
+
+    def to_dict(self):
+        me = {}
+        for name in PROFILE_FIELDS:
+            value = self.field(name)
+            if value is not None or name != 'country':
+                me[name] = value
+        return me
+
+
+def load_profiles(api, steamids):
+    batch = ProfileBatch(api, steamids)
+    return [Profile(api, steamid, batch) for steamid in batch.steamids]
@@ -0,0 +1,151 @@
+import calendar
+import datetime
+import re
+import sys
+import time
+
+from .util import csgo_misc, steam_misc
+
+PROFILE_LINK = steam_misc['comm'] + "profiles/%d"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S GMT"
+AVATAR_HASH = re.compile(r'^([^%]*/)([0-9a-f]{40})([^%/]*)$')
+
+
+def to_int(value, suffix=''):
+    number = value[:len(value) - len(suffix)] if value.endswith(suffix) else None
+    digits = number[1:] if number and number[0] == '-' else number
+    # only canonical numbers become ints so from_int gives the same text back, '-0' and '07' stay strings
+    if digits and digits.isascii() and digits.isdigit() and (number == '0' or digits[0] != '0'):
+        return int(number)
+    if not value:
+        return None
+    return sys.intern(value)
+
+
+def from_int(value, suffix=''):
+    if value is None:
+        return ''
+    if isinstance(value, int):
+        return "%d%s" % (value, suffix)
+    return value
+
+
+class PlayerRecord(object):
+    __slots__ = ('steamid', 'player_name', 'profile_link', 'icon_format', 'icon_hash', 'ping', 'kills', 'assists',
+                 'deaths', 'mvps', 'hs_percent', 'score')
+
+    def __init__(self, steamid, player_name, profile_link, player_icon, ping, kills, assists, deaths, mvps,
+                 hs_percent, score):
+        self.steamid = steamid
+        self.player_name = player_name
+        self.profile_link = profile_link
+        self.player_icon = player_icon
+        self.ping = ping
+        self.kills = kills
+        self.assists = assists
+        self.deaths = deaths
+        self.mvps = mvps
+        self.hs_percent = hs_percent
+        self.score = score
+
+    @property
+    def player_icon(self):
+        if self.icon_hash is None:
+            return self.icon_format
+        return self.icon_format % self.icon_hash.hex()
+
+    @player_icon.setter
+    def player_icon(self, icon):
+        avatar = AVATAR_HASH.match(icon)
+        if avatar:
+            self.icon_format = sys.intern(avatar.group(1) + '%s' + avatar.group(3))
+            self.icon_hash = bytes.fromhex(avatar.group(2))
+        else:
+            self.icon_format = icon
+            self.icon_hash = None
+
+    @classmethod
+    def from_dict(cls, player):
+        steamid = int(player['steamid'])
+        profile_link = player['profile_link']
+        return cls(steamid, sys.intern(player['player_name']),
+                   None if profile_link == PROFILE_LINK % steamid else sys.intern(profile_link),
+                   player['player_icon'], to_int(player['ping']), to_int(player['kills']),
+                   to_int(player['assists']), to_int(player['deaths']), to_int(player['mvps']),
+                   to_int(player['hs_percent'], '%'), to_int(player['score']))
+
+    def to_dict(self):
+        return {
+            'player_name': self.player_name,
+            'profile_link': PROFILE_LINK % self.steamid if self.profile_link is None else self.profile_link,
+            'steamid': str(self.steamid),
+            'player_icon': self.player_icon,
+            'ping': from_int(self.ping),
+            'kills': from_int(self.kills),
+            'assists': from_int(self.assists),
+            'deaths': from_int(self.deaths),
+            'mvps': from_int(self.mvps),
+            'hs_percent': from_int(self.hs_percent, '%'),
+            'score': from_int(self.score),
+        }
+
+
+class MatchRecord(object):
+    __slots__ = ('gamemode', 'map', 'timestamp', 'search_time', 'play_time', 'replay', 'score', 'teams', 'status')
+
+    def __init__(self, gamemode, map, timestamp, search_time, play_time, replay, score, teams, status):
+        self.gamemode = gamemode
+        self.map = map
+        self.timestamp = timestamp
+        self.search_time = search_time
+        self.play_time = play_time
+        self.replay = replay
+        self.score = score
+        self.teams = teams
+        self.status = status
+
+    @property
+    def date(self):
+        return time.strftime(DATE_FORMAT, time.gmtime(self.timestamp))
+
+    @property
+    def datetime(self):
+        return datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=self.timestamp)
+
+    @property
+    def players(self):
+        return self.teams[0] + self.teams[1]
+
+    @classmethod
+    def from_dict(cls, game, team_names=csgo_misc['teams']):
+        info = game['info']
+        stat = game['stat']
+        timestamp = calendar.timegm(time.strptime(info['date'].replace("GMT", "").strip(), "%Y-%m-%d %H:%M:%S"))
+        score = tuple(int(side) for side in stat['game_score'].split(' : '))
+        teams = tuple(tuple(PlayerRecord.from_dict(player) for player in stat[team]) for team in team_names)
+        return cls(sys.intern(info['gamemode']), sys.intern(info['map']), timestamp,
+                   sys.intern(info['search_time']), sys.intern(info['play_time']), info.get('replay'),
+                   score, teams, stat['status'])
+
+    def to_dict(self, team_names=csgo_misc['teams']):
+        info = {'gamemode': self.gamemode, 'map': self.map, 'date': self.date,
+                'search_time': self.search_time, 'play_time': self.play_time}
+        if self.replay is not None:
+            info['replay'] = self.replay
+        stat = {'game_score': "%d : %d" % self.score}
+        for team, players in zip(team_names, self.teams):
+            stat[team] = [player.to_dict() for player in players]
+        stat['status'] = self.status
+        return {'info': info, 'stat': stat}
+
+
+def compact_games(games):
+    if isinstance(games, dict):
+        return {gamemode: compact_games(mode_games) for gamemode, mode_games in games.items()}
+    return [MatchRecord.from_dict(game) for game in games]
+
+
+def expand_games(records):
+    if isinstance(records, dict):
+        return {gamemode: expand_games(mode_records) for gamemode, mode_records in records.items()}
+    return [record.to_dict() for record in records]
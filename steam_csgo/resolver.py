@@ -0,0 +1,160 @@
+import json
+import re
+import sqlite3
+import threading
+from urllib.parse import urljoin
+
+from .lazy import LazyModule
+from .util import steam_misc
+
+asyncio = LazyModule('asyncio')
+futures = LazyModule('concurrent.futures')
+steamidapi = LazyModule('steam.steamid')
+
+PROFILE_URL = re.compile(r'^(?:https?://)?steamcommunity\.com/(?P<type>profiles|id|user)/(?P<value>[^/?#]+)', re.I)
+PROFILE_DATA = re.compile(r"g_rgProfileData = (?P<json>{.*?});[ \t\r]*\n")
+
+
+def parse_link(link):
+    match = PROFILE_URL.match(link.strip())
+    if not match:
+        return None, None
+    kind = match.group('type').lower()
+    if kind in ('profiles', 'user'):
+        return kind, match.group('value')
+    return 'id', match.group('value').lower()
+
+
+class LinkCache(object):
+    def __init__(self, path=None, flush_size=256):
+        self.path = path
+        self.flush_size = flush_size
+        self.links = {}
+        self.pending = {}
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute("CREATE TABLE IF NOT EXISTS vanity_links "
+                                 "(vanity TEXT PRIMARY KEY, steamid INTEGER NOT NULL)")
+            self.links.update(self._db.execute("SELECT vanity, steamid FROM vanity_links"))
+
+    def get(self, vanity):
+        return self.links.get(vanity)
+
+    def add(self, vanity, steamid):
+        steamid = int(steamid)
+        if self.links.get(vanity) == steamid:
+            return
+        with self._lock:
+            self.links[vanity] = steamid
+            if self._db is not None:
+                self.pending[vanity] = steamid
+                if len(self.pending) >= self.flush_size:
+                    self._flush()
+
+    def add_link(self, link, steamid):
+        kind, value = parse_link(link)
+        if kind == 'id':
+            self.add(value, steamid)
+
+    def add_games(self, games):
+        if isinstance(games, dict):
+            games = [game for mode_games in games.values() for game in mode_games]
+        for game in games:
+            for team in game['stat'].values():
+                if isinstance(team, list):
+                    for player in team:
+                        if '/id/' in player['profile_link']:
+                            self.add_link(player['profile_link'], player['steamid'])
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._db is not None and self.pending:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO vanity_links (vanity, steamid) VALUES (?, ?)",
+                                     list(self.pending.items()))
+            self.pending.clear()
+
+    def close(self):
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class SteamIDResolver(object):
+    def __init__(self, api, cache=None, workers=8):
+        self.api = api
+        self.cache = cache if cache is not None else LinkCache()
+        self.workers = workers
+
+    def resolve(self, links):
+        result, missing = self.resolve_local(links)
+        if missing:
+            with futures.ThreadPoolExecutor(min(self.workers, len(missing))) as executor:
+                self.fill(result, missing, executor.map(self.resolve_vanity, missing))
+        return result
+
+    async def resolve_async(self, links):
+        result, missing = self.resolve_local(links)
+        if missing:
+            self.fill(result, missing, await asyncio.gather(*[self.resolve_vanity_async(vanity)
+                                                              for vanity in missing]))
+        return result
+
+    def resolve_local(self, links):
+        result = [None] * len(links)
+        missing = {}
+        for i, link in enumerate(links):
+            kind, value = parse_link(link)
+            if kind == 'profiles':
+                steamid = steamidapi.SteamID(value)
+                result[i] = steamid.as_64 if steamid.is_valid() else None
+            elif kind == 'user':
+                steamid = steamidapi.from_invite_code(value)
+                result[i] = steamid.as_64 if steamid is not None and steamid.is_valid() else None
+            elif kind == 'id':
+                result[i] = self.cache.get(value)
+                if result[i] is None:
+                    missing.setdefault(value, []).append(i)
+        return result, missing
+
+    def fill(self, result, missing, steamids):
+        for vanity, steamid in zip(missing, steamids):
+            if steamid is None:
+                continue
+            self.cache.add(vanity, steamid)
+            for i in missing[vanity]:
+                result[i] = steamid
+        self.cache.flush()
+
+    def resolve_one(self, link):
+        return self.resolve([link])[0]
+
+    def resolve_vanity(self, vanity):
+        if self.api.webclient is None:
+            return steamidapi.steam64_from_url(urljoin(steam_misc['comm'], 'id/%s/' % vanity))
+        url, params = self.vanity_request(vanity)
+        return self.parse_vanity(self.api.webclient.get_(url, params=params).text)
+
+    async def resolve_vanity_async(self, vanity):
+        url, params = self.vanity_request(vanity)
+        return self.parse_vanity((await self.api.webclient.get_(url, params=params)).text)
+
+    def vanity_request(self, vanity):
+        if self.api.api_key:
+            return (urljoin(steam_misc['api'], "ISteamUser/ResolveVanityURL/v1/"),
+                    dict(key=self.api.api_key, vanityurl=vanity))
+        return urljoin(steam_misc['comm'], 'id/%s/' % vanity), None
+
+    def parse_vanity(self, text):
+        if self.api.api_key:
+            data = self.api.extract_json(text)['response']
+            return int(data['steamid']) if data.get('success') == 1 else None
+        match = PROFILE_DATA.search(text)
+        return int(json.loads(match.group('json'))['steamid']) if match else None
@@ -0,0 +1,141 @@
+import heapq
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .lazy import LazyModule
+
+asyncio = LazyModule('asyncio')
+
+PRIORITIES = {'interactive': 0, 'default': 1, 'background': 2}
+
+HOST_RATES = {
+    'steamcommunity.com': 2.0,
+    'api.steampowered.com': 5.0,
+}
+
+
+class HostBucket(object):
+    def __init__(self, rate, burst, min_rate):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.waiters = []
+        self.requests = 0
+        self.throttled = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RateLimitScheduler(object):
+    def __init__(self, rates=None, default_rate=2.0, burst=4, min_rate=0.1, recovery=0.05):
+        self.rates = dict(HOST_RATES, **(rates or {}))
+        self.default_rate = default_rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.buckets = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def host(url):
+        return urlsplit(url).hostname or url
+
+    def bucket(self, host):
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = HostBucket(self.rates.get(host, self.default_rate), self.burst,
+                                                     self.min_rate)
+        return bucket
+
+    def acquire(self, url, priority='default'):
+        entry = (PRIORITIES.get(priority, priority), next(self._counter))
+        start = time.monotonic()
+        with self._cond:
+            bucket = self.bucket(self.host(url))
+            heapq.heappush(bucket.waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    if bucket.waiters[0] == entry and bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        break
+                    timeout = (1 - bucket.tokens) / bucket.rate if bucket.waiters[0] == entry else None
+                    self._cond.wait(timeout)
+            finally:
+                self._leave(bucket, entry)
+            return self._record_wait(bucket, start)
+
+    async def acquire_async(self, url, priority='default'):
+        # same queue as acquire, but waits with asyncio.sleep instead of blocking an executor thread
+        entry = (PRIORITIES.get(priority, priority), next(self._counter))
+        start = time.monotonic()
+        with self._cond:
+            bucket = self.bucket(self.host(url))
+            heapq.heappush(bucket.waiters, entry)
+        try:
+            while True:
+                with self._cond:
+                    bucket.refill(time.monotonic())
+                    if bucket.waiters[0] == entry and bucket.tokens >= 1:
+                        bucket.tokens -= 1
+                        break
+                    # waiters behind the head check again once the next token can be available
+                    delay = max(1 - bucket.tokens, 0 if bucket.waiters[0] == entry else 1) / bucket.rate
+                await asyncio.sleep(delay)
+        finally:
+            with self._cond:
+                self._leave(bucket, entry)
+        with self._cond:
+            return self._record_wait(bucket, start)
+
+    def _leave(self, bucket, entry):
+        bucket.waiters.remove(entry)
+        heapq.heapify(bucket.waiters)
+        self._cond.notify_all()
+
+    @staticmethod
+    def _record_wait(bucket, start):
+        waited = time.monotonic() - start
+        bucket.requests += 1
+        bucket.wait_total += waited
+        bucket.wait_max = max(bucket.wait_max, waited)
+        return waited
+
+    def report(self, url, status):
+        with self._cond:
+            bucket = self.bucket(self.host(url))
+            if status == 429:
+                bucket.throttled += 1
+                bucket.rate = max(bucket.min_rate, bucket.rate / 2)
+                bucket.tokens = min(bucket.tokens, 0)
+            elif status is not None and status < 400 and bucket.rate < bucket.max_rate:
+                bucket.rate = min(bucket.max_rate, bucket.rate + self.recovery)
+            self._cond.notify_all()
+
+    def report_response(self, url, resp):
+        retries = getattr(getattr(resp, 'raw', None), 'retries', None)
+        for attempt in getattr(retries, 'history', ()):
+            self.report(url, attempt.status)
+        self.report(url, resp.status_code)
+
+    def stats(self):
+        with self._cond:
+            return {host: {'rate': bucket.rate, 'max_rate': bucket.max_rate, 'queue_depth': len(bucket.waiters),
+                           'requests': bucket.requests, 'throttled': bucket.throttled,
+                           'wait_avg': bucket.wait_total / bucket.requests if bucket.requests else 0.0,
+                           'wait_max': bucket.wait_max}
+                    for host, bucket in self.buckets.items()}
+
+
+default_scheduler = RateLimitScheduler()
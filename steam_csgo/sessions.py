@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class FileSessionStore(object):
+    def __init__(self, directory, max_age=None):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, username):
+        return os.path.join(self.directory, hashlib.sha1(username.lower().encode('utf8')).hexdigest() + '.json')
+
+    def load(self, username):
+        try:
+            with open(self.path(username), 'r', encoding='utf8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self.max_age is not None and time.time() - data.get('saved', 0) > self.max_age:
+            return None
+        return data
+
+    def save(self, username, data):
+        data = dict(data, saved=time.time())
+        path = self.path(username)
+        tmp_path = path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, username):
+        try:
+            os.remove(self.path(username))
+        except OSError:
+            pass
+
+
+class SQLiteSessionStore(object):
+    def __init__(self, path, max_age=None):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            # cookies and api keys are stored here, sqlite creates journal files with the same mode
+            os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+            os.chmod(path, 0o600)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS sessions "
+                             "(username TEXT PRIMARY KEY, data TEXT NOT NULL, saved REAL NOT NULL)")
+
+    def load(self, username):
+        with self._lock:
+            row = self._db.execute("SELECT data, saved FROM sessions WHERE username = ?",
+                                   (username.lower(),)).fetchone()
+        if row is None:
+            return None
+        if self.max_age is not None and time.time() - row[1] > self.max_age:
+            return None
+        return json.loads(row[0])
+
+    def save(self, username, data):
+        saved = time.time()
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO sessions (username, data, saved) VALUES (?, ?, ?)",
+                             (username.lower(), json.dumps(dict(data, saved=saved)), saved))
+
+    def delete(self, username):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sessions WHERE username = ?", (username.lower(),))
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,250 @@
+import calendar
+import datetime
+import sqlite3
+import threading
+import time
+
+from .records import DATE_FORMAT, from_int, to_int
+from .util import csgo_misc
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    account INTEGER NOT NULL,
+    gamemode TEXT NOT NULL,
+    map TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    search_time TEXT,
+    play_time TEXT,
+    replay TEXT,
+    score_a INTEGER NOT NULL,
+    score_b INTEGER NOT NULL,
+    status INTEGER,
+    UNIQUE (account, timestamp, map, score_a, score_b)
+);
+CREATE INDEX IF NOT EXISTS matches_timestamp ON matches (timestamp);
+CREATE INDEX IF NOT EXISTS matches_map ON matches (map);
+CREATE TABLE IF NOT EXISTS players (
+    steamid INTEGER PRIMARY KEY,
+    player_name TEXT,
+    profile_link TEXT,
+    player_icon TEXT,
+    last_seen INTEGER
+);
+CREATE TABLE IF NOT EXISTS match_players (
+    match_id INTEGER NOT NULL REFERENCES matches (id) ON DELETE CASCADE,
+    steamid INTEGER NOT NULL,
+    team INTEGER NOT NULL,
+    player_name TEXT,
+    profile_link TEXT,
+    player_icon TEXT,
+    ping, kills, assists, deaths, mvps, hs_percent, score,
+    PRIMARY KEY (match_id, steamid)
+);
+CREATE INDEX IF NOT EXISTS match_players_steamid ON match_players (steamid);
+CREATE TABLE IF NOT EXISTS bans (
+    steamid INTEGER PRIMARY KEY,
+    vac_banned INTEGER NOT NULL,
+    vac_bans INTEGER NOT NULL,
+    game_bans INTEGER NOT NULL,
+    days_since_last_ban INTEGER NOT NULL,
+    ban_time INTEGER,
+    checked INTEGER NOT NULL
+);
+"""
+
+STAT_FIELDS = ('ping', 'kills', 'assists', 'deaths', 'mvps', 'hs_percent', 'score')
+
+
+def to_timestamp(date):
+    if date is None or isinstance(date, (int, float)):
+        return date
+    if isinstance(date, datetime.datetime):
+        return calendar.timegm(date.timetuple())
+    return calendar.timegm(time.strptime(date.replace("GMT", "").strip(), "%Y-%m-%d %H:%M:%S"))
+
+
+class MatchStore(object):
+    def __init__(self, path, team_names=csgo_misc['teams']):
+        self.path = path
+        self.team_names = team_names
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._db:
+            self._db.execute("PRAGMA foreign_keys = ON")
+            self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_games(self, account, games):
+        if isinstance(games, dict):
+            games = [game for mode_games in games.values() for game in mode_games]
+        account = int(account)
+        players = []
+        stats = []
+        with self._lock, self._db:
+            cursor = self._db.cursor()
+            for game in games:
+                info = game['info']
+                stat = game['stat']
+                timestamp = to_timestamp(info['date'])
+                score_a, score_b = (int(side) for side in stat['game_score'].split(' : '))
+                cursor.execute("INSERT INTO matches (account, gamemode, map, timestamp, search_time, play_time, "
+                               "replay, score_a, score_b, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                               "ON CONFLICT (account, timestamp, map, score_a, score_b) DO UPDATE SET "
+                               "replay = coalesce(excluded.replay, replay), status = excluded.status",
+                               (account, info['gamemode'], info['map'], timestamp, info['search_time'],
+                                info['play_time'], info.get('replay'), score_a, score_b, stat['status']))
+                match_id = cursor.execute("SELECT id FROM matches WHERE account = ? AND timestamp = ? AND map = ? "
+                                          "AND score_a = ? AND score_b = ?",
+                                          (account, timestamp, info['map'], score_a, score_b)).fetchone()[0]
+                for team, team_name in enumerate(self.team_names):
+                    for player in stat[team_name]:
+                        steamid = int(player['steamid'])
+                        players.append((steamid, player['player_name'], player['profile_link'],
+                                        player['player_icon'], timestamp))
+                        stats.append((match_id, steamid, team, player['player_name'], player['profile_link'],
+                                      player['player_icon'],
+                                      *(to_int(player[name], '%' if name == 'hs_percent' else '')
+                                        for name in STAT_FIELDS)))
+            cursor.executemany("INSERT INTO players (steamid, player_name, profile_link, player_icon, last_seen) "
+                               "VALUES (?, ?, ?, ?, ?) ON CONFLICT (steamid) DO UPDATE SET "
+                               "player_name = excluded.player_name, profile_link = excluded.profile_link, "
+                               "player_icon = excluded.player_icon, last_seen = excluded.last_seen "
+                               "WHERE excluded.last_seen >= last_seen", players)
+            cursor.executemany("INSERT OR REPLACE INTO match_players (match_id, steamid, team, player_name, "
+                               "profile_link, player_icon, ping, kills, assists, deaths, mvps, hs_percent, score) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", stats)
+        return len(games)
+
+    def add_bans(self, bans, checked=None):
+        if isinstance(bans, dict):
+            bans = bans.values()
+        checked = int(checked or time.time())
+        rows = []
+        for ban in bans:
+            banned = ban['VACBanned'] or ban['NumberOfGameBans'] > 0
+            rows.append((int(ban['SteamId']), int(bool(ban['VACBanned'])), ban['NumberOfVACBans'],
+                         ban['NumberOfGameBans'], ban['DaysSinceLastBan'],
+                         checked - ban['DaysSinceLastBan'] * 86400 if banned else None, checked))
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO bans (steamid, vac_banned, vac_bans, game_bans, "
+                                 "days_since_last_ban, ban_time, checked) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def refresh_bans(self, api, since=None, account=None):
+        steamids = [player['steamid'] for player in self.encountered_players(since, account)]
+        bans = api.get_player_bans(steamids, use_cache=False)
+        self.add_bans(bans)
+        return bans
+
+    def query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def get_games(self, match_ids):
+        match_ids = list(match_ids)
+        if not match_ids:
+            return []
+        games = {}
+        teams = {}
+        for i in range(0, len(match_ids), 500):
+            chunk = match_ids[i:i + 500]
+            marks = ','.join('?' * len(chunk))
+            for row in self.query("SELECT * FROM matches WHERE id IN (%s)" % marks, chunk):
+                info = {'gamemode': row['gamemode'], 'map': row['map'],
+                        'date': time.strftime(DATE_FORMAT, time.gmtime(row['timestamp'])),
+                        'search_time': row['search_time'], 'play_time': row['play_time']}
+                if row['replay'] is not None:
+                    info['replay'] = row['replay']
+                games[row['id']] = {'info': info, 'stat': {'game_score': "%d : %d" % (row['score_a'],
+                                                                                     row['score_b'])},
+                                    'status': row['status']}
+                teams[row['id']] = ([], [])
+            for row in self.query("SELECT * FROM match_players WHERE match_id IN (%s) ORDER BY rowid" % marks,
+                                  chunk):
+                player = {'player_name': row['player_name'], 'profile_link': row['profile_link'],
+                          'steamid': str(row['steamid']), 'player_icon': row['player_icon']}
+                for name in STAT_FIELDS:
+                    player[name] = from_int(row[name], '%' if name == 'hs_percent' else '')
+                teams[row['match_id']][row['team']].append(player)
+        result = []
+        for match_id in match_ids:
+            game = games.get(match_id)
+            if game is None:
+                continue
+            for team_name, players in zip(self.team_names, teams[match_id]):
+                game['stat'][team_name] = players
+            game['stat']['status'] = game.pop('status')
+            result.append(game)
+        return result
+
+    def match_ids(self, where, params=()):
+        return [row[0] for row in self.query("SELECT m.id FROM matches m WHERE %s ORDER BY m.timestamp DESC" % where,
+                                             params)]
+
+    def games(self, account=None, since=None, map=None):
+        where, params = self.filters(account, since, map)
+        return self.get_games(self.match_ids(where, params))
+
+    def games_with(self, steamid, account=None, since=None, map=None):
+        where, params = self.filters(account, since, map)
+        return self.get_games(self.match_ids(
+            where + " AND m.id IN (SELECT match_id FROM match_players WHERE steamid = ?)", params + [int(steamid)]))
+
+    def filters(self, account=None, since=None, map=None):
+        where = ["1"]
+        params = []
+        if account is not None:
+            where.append("m.account = ?")
+            params.append(int(account))
+        if since is not None:
+            where.append("m.timestamp >= ?")
+            params.append(to_timestamp(since))
+        if map is not None:
+            where.append("m.map = ?")
+            params.append(map)
+        return " AND ".join(where), params
+
+    def encountered_players(self, since=None, account=None, opponents=False):
+        where, params = self.filters(account, since)
+        rows = self.query(
+            "SELECT mp.steamid, p.player_name, count(*) AS matches, max(m.timestamp) AS last_seen "
+            "FROM match_players mp JOIN matches m ON m.id = mp.match_id "
+            "JOIN players p ON p.steamid = mp.steamid "
+            "JOIN match_players me ON me.match_id = mp.match_id AND me.steamid = m.account "
+            "WHERE %s AND mp.steamid != m.account%s GROUP BY mp.steamid ORDER BY last_seen DESC"
+            % (where, " AND mp.team != me.team" if opponents else ""), params)
+        return [{'steamid': str(row['steamid']), 'player_name': row['player_name'], 'matches': row['matches'],
+                 'last_seen': time.strftime(DATE_FORMAT, time.gmtime(row['last_seen']))} for row in rows]
+
+    def banned_opponents(self, since=None, account=None, after_only=False):
+        where, params = self.filters(account, since)
+        rows = self.query(
+            "SELECT mp.steamid, p.player_name, count(*) AS matches, max(m.timestamp) AS last_match, "
+            "b.vac_banned, b.vac_bans, b.game_bans, b.days_since_last_ban, b.ban_time "
+            "FROM match_players mp JOIN matches m ON m.id = mp.match_id "
+            "JOIN match_players me ON me.match_id = mp.match_id AND me.steamid = m.account "
+            "JOIN players p ON p.steamid = mp.steamid JOIN bans b ON b.steamid = mp.steamid "
+            "WHERE %s AND mp.team != me.team AND (b.vac_banned OR b.game_bans > 0) "
+            "GROUP BY mp.steamid ORDER BY b.ban_time DESC" % where, params)
+        opponents = []
+        for row in rows:
+            after = row['ban_time'] > row['last_match']
+            if after_only and not after:
+                continue
+            opponents.append({'steamid': str(row['steamid']), 'player_name': row['player_name'],
+                              'matches': row['matches'],
+                              'last_match': time.strftime(DATE_FORMAT, time.gmtime(row['last_match'])),
+                              'banned': True, 'VAC': bool(row['vac_banned']), 'VAC_counts': row['vac_bans'],
+                              'overwatch': row['game_bans'] > 0, 'ov_counts': row['game_bans'], 'after': after,
+                              'DaysSinceLastBan': row['days_since_last_ban']})
+        return opponents
@@ -0,0 +1,41 @@
+import json
+import os
+
+
+class SyncState(object):
+    def __init__(self, path=None):
+        self.path = path
+        self.cursors = {}
+        if self.path and os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf8') as f:
+                self.cursors = json.load(f)
+
+    @staticmethod
+    def key(account, gamemode):
+        return "%s:%s" % (account, gamemode)
+
+    def get(self, account, gamemode):
+        cursor = self.cursors.get(self.key(account, gamemode), {})
+        return {"date": cursor.get("date"), "continue_token": cursor.get("continue_token", 0),
+                "head_token": cursor.get("head_token"), "head_date": cursor.get("head_date")}
+
+    def set(self, account, gamemode, cursor):
+        self.cursors[self.key(account, gamemode)] = {"date": cursor.get("date"),
+                                                     "continue_token": cursor.get("continue_token"),
+                                                     "head_token": cursor.get("head_token"),
+                                                     "head_date": cursor.get("head_date")}
+        self.save()
+
+    def reset(self, account, gamemode=None):
+        for key in list(self.cursors):
+            if key == self.key(account, gamemode) or (gamemode is None and key.startswith("%s:" % account)):
+                del self.cursors[key]
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf8') as f:
+            json.dump(self.cursors, f)
+        os.replace(tmp_path, self.path)
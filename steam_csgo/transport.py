@@ -0,0 +1,69 @@
+import random
+
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def make_retry(retries=5, backoff_factor=0.5, backoff_jitter=0.5, status_forcelist=RETRY_STATUSES):
+    options = dict(total=retries, connect=retries, read=retries, status=retries,
+                   backoff_factor=backoff_factor, status_forcelist=status_forcelist,
+                   allowed_methods=frozenset(['GET', 'HEAD']), respect_retry_after_header=True,
+                   raise_on_status=False)
+    try:
+        return Retry(backoff_jitter=backoff_jitter, **options)
+    except TypeError:
+        return Retry(**options)
+
+
+def connection_retry(retry):
+    # the adapter keeps connect/read retries, 429/5xx are retried by WebAuth.get_ so each attempt takes a scheduler token
+    return retry.new(status_forcelist=frozenset(), respect_retry_after_header=False)
+
+
+def status_retries(retry):
+    count = retry.status if retry.status is not None else retry.total
+    return count if isinstance(count, int) else 0
+
+
+def backoff_time(retry, attempt, resp=None):
+    retry_after = resp.headers.get('Retry-After') if resp is not None and retry.respect_retry_after_header else None
+    if retry_after:
+        try:
+            return retry.parse_retry_after(retry_after)
+        except InvalidHeader:
+            pass
+    delay = retry.backoff_factor * (2 ** attempt) + random.random() * getattr(retry, 'backoff_jitter', 0.0)
+    return min(delay, getattr(retry, 'backoff_max', Retry.DEFAULT_BACKOFF_MAX))
+
+
+def mount_transport(session, pool_connections=10, pool_maxsize=32, timeout=(5, 20), retry=None,
+                    adapter_class=TimeoutHTTPAdapter):
+    adapter = adapter_class(timeout, pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                            max_retries=make_retry() if retry is None else retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+def transport_info(resp):
+    return {
+        'compressed': resp.headers.get('Content-Encoding', '') in ('gzip', 'deflate', 'br'),
+        'keep_alive': resp.headers.get('Connection', 'keep-alive').lower() != 'close',
+        'retries': len(resp.raw.retries.history) if getattr(resp.raw, 'retries', None) else 0,
+    }
@@ -1,9 +1,23 @@
+import time
+import warnings
+
 from steam import webauth
 
+from .scheduler import default_scheduler
+from .transport import (RETRY_STATUSES, TimeoutHTTPAdapter, backoff_time, connection_retry, make_retry,
+                        mount_transport, status_retries, transport_info)
+
 
 class WebAuth(webauth.WebAuth):
-    def __init__(self):
-        self.session = webauth.make_requests_session()
+    def __init__(self, cache=None, pool_maxsize=32, timeout=(5, 20), retry=None, scheduler=default_scheduler,
+                 adapter_class=TimeoutHTTPAdapter, metrics=None):
+        self.retry = make_retry() if retry is None else retry
+        self.session = mount_transport(webauth.make_requests_session(), pool_maxsize=pool_maxsize,
+                                       timeout=timeout, retry=connection_retry(self.retry),
+                                       adapter_class=adapter_class)
+        self.cache = cache
+        self.scheduler = scheduler
+        self.metrics = metrics
 
     @staticmethod
     def get_rsa(username):
@@ -12,12 +26,72 @@ class WebAuth(webauth.WebAuth):
     def get_captcha(self, gid):
         return "https://steamcommunity.com/login/rendercaptcha/?gid=%s" % gid
 
-    def get_(self, url, **kwars):
+    def get_(self, url, use_cache=True, priority='default', **kwars):
+        key = None
+        if self.cache is not None and use_cache:
+            key = self.cache.make_key(url, kwars.get('params'))
+            resp = self.cache.get(key)
+            if resp is not None:
+                if self.metrics is not None:
+                    self.metrics.record_cache_hit(url)
+                return resp
+        start = time.perf_counter()
+        retries = status_retries(self.retry)
+        attempts = 0
+        for attempt in range(retries + 1):
+            resp = self.send(url, priority, **kwars)
+            history = getattr(getattr(getattr(resp, 'raw', None), 'retries', None), 'history', ())
+            attempts += len(history)
+            if resp.status_code not in RETRY_STATUSES or attempt == retries:
+                break
+            attempts += 1
+            time.sleep(backoff_time(self.retry, attempt, resp))
+        if self.metrics is not None:
+            self.metrics.record_response(url, resp, time.perf_counter() - start, attempts)
+        if key is not None and resp.ok:
+            self.cache.set(key, resp)
+        return resp
+
+    def send(self, url, priority='default', **kwargs):
+        if self.scheduler is not None:
+            self.scheduler.acquire(url, priority)
+        resp = self.session.get(url, **kwargs)
+        if self.scheduler is not None:
+            self.scheduler.report_response(url, resp)
+        return resp
+
+    def set_session_cookies(self, language='english'):
         for domain in ['store.steampowered.com', 'help.steampowered.com', 'steamcommunity.com']:
-            self.session.cookies.set('Steam_Language', "english", domain=domain)
+            self.session.cookies.set('Steam_Language', language, domain=domain)
             self.session.cookies.set('birthtime', '-3333', domain=domain)
             self.session.cookies.set('sessionid', self.session_id, domain=domain)
-        return self.session.get(url, **kwars)
+
+    def verify_transport(self, url='https://steamcommunity.com/'):
+        return transport_info(self.send(url, 'interactive'))
+
+    def export_session(self):
+        return {
+            'cookies': [{'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path,
+                         'secure': cookie.secure, 'expires': cookie.expires} for cookie in self.session.cookies],
+            'session_id': self.session_id,
+            'steam_id': self.steam_id.as_64,
+        }
+
+    def restore_session(self, data):
+        for cookie in data['cookies']:
+            self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'],
+                                     secure=cookie['secure'], expires=cookie['expires'])
+        self.session_id = data['session_id']
+        self.steam_id = webauth.SteamID(data['steam_id'])
+        self.logged_on = True
+        self.set_session_cookies()
+
+    def check_session(self):
+        try:
+            resp = self.send('https://steamcommunity.com/chat/clientjstoken', 'interactive', timeout=15)
+            return bool(resp.ok and resp.json().get('logged_in'))
+        except (webauth.requests.exceptions.RequestException, ValueError):
+            return False
 
     def _send_raw(self, username='', password='', timestamp='', captcha='',
                     captcha_gid=-1, email_code='', steam_id='', twofactor_code=''):
@@ -40,7 +114,10 @@ class WebAuth(webauth.WebAuth):
             raise webauth.HTTPError(str(e))
 
     def login_raw(self, username='', password='', timestamp='', captcha='', captcha_gid=-1,
-              email_code='', steam_id='', twofactor_code='', language='english'):
+              email_code='', steam_id='', twofactor_code='', language=None):
+        if language is not None:
+            warnings.warn("login_raw(language=...) is deprecated and ignored, pages are always requested in english "
+                          "because parsers rely on english text", DeprecationWarning, stacklevel=2)
         resp = self._send_raw(username=username, password=password, timestamp=timestamp,
                               captcha=captcha, captcha_gid=captcha_gid, email_code=email_code,
                               steam_id=steam_id, twofactor_code=twofactor_code)
@@ -53,10 +130,7 @@ class WebAuth(webauth.WebAuth):
 
             self.session_id = webauth.generate_session_id()
 
-            for domain in ['store.steampowered.com', 'help.steampowered.com', 'steamcommunity.com']:
-                self.session.cookies.set('Steam_Language', language, domain=domain)
-                self.session.cookies.set('birthtime', '-3333', domain=domain)
-                self.session.cookies.set('sessionid', self.session_id, domain=domain)
+            self.set_session_cookies()
             self._finalize_login(resp)
 
             return self.session
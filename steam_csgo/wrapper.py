@@ -1,24 +1,43 @@
 import datetime
 import json
+import queue
 import re
+import threading
+import time
 from base64 import b64encode
+from functools import lru_cache
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup as Bs
-from steam import steamid as steamidapi
-from steam import webapi
-from steam.core.cm import CMServerList
-from steam.core.crypto import rsa_publickey, pkcs1v15_encrypt
-
+from .backfill import Backfill
+from .cache import ResponseCache
+from .lazy import LazyModule
+from .metrics import timed
+from .parsers import parser_backends
+from .profile import Profile, load_profiles
+from .resolver import SteamIDResolver
+from .scheduler import default_scheduler
 from .util import csgo_misc, steam_misc
-from .webauth import WebAuth
+
+bs4 = LazyModule('bs4')
+steamidapi = LazyModule('steam.steamid')
+cm = LazyModule('steam.core.cm')
+crypto = LazyModule('steam.core.crypto')
+webapi = LazyModule('steam.webapi')
+webauth = LazyModule('steam_csgo.webauth')
+
+__all__ = ['BaseCSGOApi', 'CSGOApi', 'csgo_misc', 'steam_misc']
+
+_steam_status = {'value': None, 'checked': 0.0}
+_steam_status_lock = threading.Lock()
 
 
-class CSGOApi(object):
-    def __init__(self, username, _api_key=None, _api_domain='csgohelper'):
+class BaseCSGOApi(object):
+    # account state and page parsing shared by CSGOApi and AsyncCSGOApi, no network calls here
+    def __init__(self, username, _api_key=None, _api_domain='csgohelper', _cache_size=128, _cache_ttl=60,
+                 _ban_cache_ttl=3600, _parser='bs4', _transport=None, _scheduler=default_scheduler,
+                 _metrics=None, _link_cache=None):
         self.username = username
         self.webclient = None
-        self.api_interface = None
         self.session_id = None
         self.api_key = _api_key
         self.api_domain = _api_domain
@@ -27,19 +46,26 @@ class CSGOApi(object):
         self.comm_link = None
         self.gamemodes = csgo_misc['compmodes']
         self.team_names = csgo_misc['teams']
+        self.cache = ResponseCache(_cache_size, _cache_ttl)
+        self.ban_cache = ResponseCache(100000, _ban_cache_ttl)
+        self.ban_chunk_size = 100
+        if _parser != 'bs4' and _parser not in parser_backends:
+            raise ValueError("unknown parser %r, expected 'bs4' or one of %s" % (_parser, sorted(parser_backends)))
+        self.parser = _parser
+        self.transport = _transport or {}
+        self.scheduler = _scheduler
+        self.metrics = _metrics
+        self.resolver = SteamIDResolver(self, _link_cache)
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def time(date):
+        if isinstance(date, datetime.datetime):
+            return date
         return datetime.datetime.strptime(date.replace("GMT", "").strip(), "%Y-%m-%d %H:%M:%S")
 
-    @staticmethod
-    def check_steam_status():
-        servers_con = CMServerList()
-        servers_con.bootstrap_from_dns()
-        return bool(len(servers_con))
-
     def extract_json(self, content):
-        return json.loads(content, encoding='utf8')
+        return json.loads(content)
 
     def check_for_new(self, date, check_date):
         if date and not check_date:
@@ -54,110 +80,54 @@ class CSGOApi(object):
         else:
             return False
 
-    def login_in(self, username='', password='', timestamp='', captcha='', captcha_gid=-1,
-                 email_code='', steam_id='', twofactor_code='', language='english'):
-        self.webclient = WebAuth()
-        return self.webclient.login_raw(username, password, timestamp, captcha, captcha_gid,
-                                        email_code, steam_id, twofactor_code, language)
-
-    def main(self):
-        self.session_id = self.webclient.session_id
-        self.steamid = str(self.webclient.steam_id.as_64)
-        self.comm_link = self.webclient.get_(self.webclient.steam_id.community_url).url
-        if self.comm_link[-1] != '/':
-            self.comm_link += '/'
-        elif '/home/' in self.comm_link:
-            self.comm_link = self.comm_link.replace('/home/', '/')
-        if not self.api_key:
-            self.api_key = self.get_api_key()
-            if self.api_key:
-                self.api_interface = webapi.WebAPI(self.api_key)
-                self.limited = False
-            else:
-                self.limited = True
-        me = self.load_me_full()
-        games = self.load_all_games()
-        return (me, games)
-
-    def get_api_key(self):
-        resp = self.webclient.get_("https://steamcommunity.com/dev/apikey")
-        html = Bs(resp.text, "html.parser")
-        if html.find("div", {"id": "bodyContents_lo"}):
-            return None
-        if html.find("input", {"name": "Revoke"}) is not None:
-            return html.find("div", {"id": "bodyContents_ex"}).find_all("p")[0].text.strip().split(' ')[1]
-        else:
-            self.webclient.session.post("https://steamcommunity.com/dev/registerkey", data={
-                "domain": self.api_domain,
-                "agreeToTerms": "agreed",
-                "sessionid": self.session_id,
-                "Submit": "Register"
-            })
-            return self.get_api_key()
-
-    def load_all_games(self):
-        csgo_games = {}
-        for mode in self.gamemodes:
-            csgo_games[mode] = self.load_games(mode)
-        return csgo_games
-
-    def load_new_games(self, gamemode, date=None):
-        continue_token = 0
-        games_count = 0
-        games = []
-        while continue_token is not None:
-            match_dict = self.get_games_history(gamemode, self.session_id, continue_token)
-            data = self.parse_games(gamemode, match_dict["html"])
-            for game in data:
-                if self.check_for_new(game["info"]["date"], date):
-                    games.append(game)
-                    games_count += 1
-            continue_token = match_dict["continue_token"]
-        return games
-
-    def load_games(self, gamemode):
-        continue_token = 0
-        games = []
-        while continue_token is not None:
-            match_dict = self.get_games_history(gamemode, self.session_id, continue_token)
-            if match_dict and match_dict.get("html"):
-                data = self.parse_games(gamemode, match_dict.get('html'))
-            else:
-                return []
-            for game in data:
+    def encrypt_password(self, rsa, password):
+        key = crypto.rsa_publickey(int(rsa['publickey_mod'], 16),
+                                   int(rsa['publickey_exp'], 16))
+        return b64encode(crypto.pkcs1v15_encrypt(key, password.encode('ascii')))
+
+    def save_session(self, store):
+        data = self.webclient.export_session()
+        data['comm_link'] = self.comm_link
+        data['api_key'] = self.api_key
+        store.save(self.username, data)
+
+    def sync_new_page(self, gamemode, state, cursor, match_dict, games):
+        seen = False
+        for game in self.parse_history_page(gamemode, match_dict["html"]):
+            if self.check_for_new(game["info"]["date"], cursor["date"]):
                 games.append(game)
-            continue_token = match_dict.get("continue_token")
-        return games
-
-    def load_me_full(self):
-        return {"me": self.load_me(), "matchmaking_data": self.load_matchmaking_data(),
-                "cooldown": self.load_cooldown_status()}
-
-    def load_me(self):
-        resp = self.webclient.get_(self.comm_link)
-        steam_profile = Bs(resp.text, 'html.parser')
+                if not cursor["head_date"] or self.time(game["info"]["date"]) > self.time(cursor["head_date"]):
+                    cursor["head_date"] = game["info"]["date"]
+            else:
+                seen = True
+        cursor["head_token"] = match_dict.get("continue_token")
+        done = seen or cursor["head_token"] is None
+        if done:
+            cursor["date"] = cursor["head_date"] or cursor["date"]
+            cursor["head_token"] = cursor["head_date"] = None
+        state.set(self.steamid, gamemode, cursor)
+        return done
+
+    def newest_game_date(self, games):
+        return max((game["info"]["date"] for game in games), key=self.time)
+
+    def parse_me(self, steam_profile, ban_data):
         me = {}
-        if steam_profile.find("div", {"class": "welcome_header_ctn"}):
-            return me
-        ban_data = self.load_me_ban_status()
         me['banned'] = ban_data['banned']
         me['VAC'] = ban_data['VAC']
         me['overwatch'] = ban_data['overwatch']
         me['name'] = steam_profile.find('span', {'class': 'actual_persona_name'}).text.strip()
-        me['realname'] = steam_profile.find('div', {'class': 'header_real_name ellipsis'}).find('bdi').text.strip()
-        if steam_profile.find('div', {'class': 'header_real_name ellipsis'}).find('img'):
-            me['country'] = re.findall(r'(\w+)',
-                                       steam_profile.find('div',
-                                                          {'class': 'header_real_name ellipsis'})
-                                       .find('img')['src'])[-2]
+        real_name = steam_profile.find('div', {'class': 'header_real_name ellipsis'})
+        me['realname'] = real_name.find('bdi').text.strip()
+        flag = real_name.find('img')
+        if flag:
+            me['country'] = re.findall(r'(\w+)', flag['src'])[-2]
         me['icon'] = steam_profile.find('div', {'class': 'playerAvatarAutoSizeInner'}).find('img')['src']
         me['level'] = steam_profile.find('span', {'class': 'friendPlayerLevelNum'}).text.strip()
         me['status'] = steam_profile.find('div', {'class': 'playerAvatar'})['class'][-1]
         return me
 
-    def load_matchmaking_data(self):
-        resp = self.webclient.get_(urljoin(self.comm_link, 'gcpd/730/'), params=dict(tab='matchmaking'))
-        csgo_profile = Bs(resp.text, 'html.parser')
+    def parse_matchmaking_data(self, csgo_profile):
         ranks = []
         if not csgo_profile.find('div', {'id': 'personaldata_elements_container'}):
             return ranks
@@ -177,16 +147,7 @@ class CSGOApi(object):
                 break
         return ranks
 
-    def load_me_ban_status(self):
-        if not self.limited:
-            return self.parse_player_ban(self.get_player_ban_status(self.steamid))
-        else:
-            # develop alternate method for check
-            return {'banned': None, 'VAC': None, 'overwatch': None}
-
-    def load_cooldown_status(self):
-        resp = self.webclient.get_(urljoin(self.comm_link, 'gcpd/730/'), params=dict(tab='matchmaking'))
-        csgo_profile = Bs(resp.text, 'html.parser')
+    def parse_cooldown_status(self, csgo_profile):
         cooldown = {}
         if not csgo_profile.find("div", {'id': 'personaldata_elements_container'}):
             return cooldown
@@ -199,56 +160,33 @@ class CSGOApi(object):
                 break
         return cooldown
 
-    def get_player_steamid(self, community_links):
-        if isinstance(community_links, list):
-            out = []
-            for i in community_links:
-                out.append(steamidapi.from_url(i).as_64)
-            return out
-        else:
-            return str(steamidapi.from_url(community_links).as_64)
-
-    def get_steam_profile_info(self, steamids):
-        if isinstance(steamids, list):
-            steamids = ", ".join(steamids)
-            return self.api_interface.call("ISteamUser.GetPlayerSummaries", steamids=steamids)['response']['players']
-        else:
-            return self.api_interface.call("ISteamUser.GetPlayerSummaries", steamids=steamids)['response']['players'][0]
-
-    def get_player_ban_status(self, steamids):
-        if isinstance(steamids, list):
-            steamids = ", ".join(steamids)
-            return self.extract_json(self.webclient.get_(urljoin(steam_misc['api'], "ISteamUser/GetPlayerBans/v1/"),
-                                                         params=dict(key=self.api_key, steamids=steamids)))['players']
-        else:
-            return self.extract_json(self.webclient.get_(urljoin(steam_misc['api'], "ISteamUser/GetPlayerBans/v1/"),
-                                                         params=dict(key=self.api_key, steamids=steamids))
-                                     .text)['players'][0]
+    def split_cached_bans(self, steamids, use_cache=True):
+        bans = {}
+        missing = []
+        for steamid in dict.fromkeys(steamids):
+            ban = self.ban_cache.get(steamid) if use_cache else None
+            if ban is None:
+                missing.append(steamid)
+            else:
+                bans[steamid] = ban
+        return bans, missing
 
-    def get_games_history(self, gamemode, session_id, continue_token):
-        gamemode = 'matchhistorycompetitive' if gamemode == self.gamemodes[0] else 'matchhistorywingman'
-        try:
-            resp = self.webclient.get_(urljoin(self.comm_link, 'gcpd/730/'),
-                                       params=dict(ajax=1, tab=gamemode,
-                                                   continue_token=continue_token,
-                                                   sessionid=session_id))
-            dict_resp = self.extract_json(resp.text)
-            return dict_resp
-        except json.decoder.JSONDecodeError:
-            pass
-        return None
+    def get_game_players(self, game):
+        return game['stat'][self.team_names[0]] + game['stat'][self.team_names[1]]
 
-    def get_game_cheats_stat(self, game):
-        if self.limited:
-            return []
-        all_players = game['stat'][self.team_names[0]] + game['stat'][self.team_names[1]]
-        payload = self.get_player_ban_status([p['steamid'] for p in all_players])
-        return self.parse_cheats_stat(payload, game['info']['date'])
+    def parse_history_page(self, gamemode, html):
+        # fetched pages feed the link cache here, parsers stay free of side effects
+        games = self.parse_games(gamemode, html)
+        self.resolver.cache.add_games(games)
+        return games
 
+    @timed('parse_games')
     def parse_games(self, gamemode, html):
+        if self.parser in parser_backends:
+            return parser_backends[self.parser](self, gamemode, html)
         games_set = []
         striped_html = html.strip()
-        html = Bs(striped_html, 'html.parser')
+        html = bs4.BeautifulSoup(striped_html, 'html.parser')
         games = html.find_all("tr")
         for game in games:
             columns = game.find_all("table")
@@ -260,48 +198,67 @@ class CSGOApi(object):
 
     def parse_game_info(self, column):
         replay_link = column.find('td', {'class': 'csgo_scoreboard_cell_noborder'})
-        options = column.find_all("tr")
-        game_info_dict = dict()
-        game_info_dict['gamemode'] = self.gamemodes[0] if self.gamemodes[0] in options[0].text.strip() else self.gamemodes[1]
-        game_info_dict['map'] = options[0].text.lower().replace(self.gamemodes[0], "").replace(self.gamemodes[1], "").strip()
-        game_info_dict['date'] = options[1].text.strip()
-        game_info_dict['search_time'] = re.findall(r'\d+:\d+', options[2].text.strip())[0]
-        game_info_dict['play_time'] = re.findall(r'\d+:\d+', options[3].text.strip())[0]
-        if replay_link:
-            game_info_dict['replay'] = replay_link.find('a')['href']
-        return game_info_dict
+        options = [option.text for option in column.find_all("tr")]
+        return self.make_game_info(options, replay_link.find('a')['href'] if replay_link else None)
 
+    @timed('parse_game_stat')
     def parse_game_stat(self, data, gamemode):
         player_counts = 5 if gamemode == self.gamemodes[0] else 2
         leaderboard = data.find_all("tr")
-        game_stat_dict = {}
         teams = []
-        game_stat_dict['game_score'] = leaderboard[player_counts + 1].find('td').text.strip()
         for i in range(len(self.team_names)):
             team = []
             for j in range(player_counts):
                 player_stat = leaderboard[(i * (player_counts + 1)) + 1 + j].find_all("td")
-                player_stat_dict = dict()
-                player_stat_dict['player_name'] = player_stat[0].find('a', {"class": "linkTitle"}).text.strip()
-                player_stat_dict['profile_link'] = player_stat[0].find('a', {"class": "linkTitle"})['href']
-                player_stat_dict['steamid'] = str(
-                    steamidapi.make_steam64(player_stat[0].find('img')['data-miniprofile']))
-                player_stat_dict['player_icon'] = player_stat[0].find('img')['src']
-                player_stat_dict['ping'] = player_stat[1].text.strip()
-                player_stat_dict['kills'] = player_stat[2].text.strip()
-                player_stat_dict['assists'] = player_stat[3].text.strip()
-                player_stat_dict['deaths'] = player_stat[4].text.strip()
-                player_stat_dict['mvps'] = "0" if len(re.findall(r'\d+', player_stat[5].text.strip())) == 0 else \
-                    re.findall(r'\d+', player_stat[5].text.strip())[0]
-                player_stat_dict['hs_percent'] = player_stat[6].text.strip()
-                player_stat_dict['score'] = player_stat[7].text.strip()
-                team.append(player_stat_dict)
+                link = player_stat[0].find('a', {"class": "linkTitle"})
+                icon = player_stat[0].find('img')
+                team.append(self.make_player_stat(link.text, link['href'], icon['data-miniprofile'], icon['src'],
+                                                  [cell.text for cell in player_stat]))
             teams.append(team)
+        return self.make_game_stat(leaderboard[player_counts + 1].find('td').text, teams)
+
+    def make_game_info(self, options, replay=None):
+        game_info_dict = dict()
+        game_info_dict['gamemode'] = self.gamemodes[0] if self.gamemodes[0] in options[0].lower() else self.gamemodes[1]
+        game_info_dict['map'] = options[0].lower().replace(self.gamemodes[0], "").replace(self.gamemodes[1], "").strip()
+        game_info_dict['date'] = options[1].strip()
+        game_info_dict['search_time'] = re.findall(r'\d+:\d+', options[2].strip())[0]
+        game_info_dict['play_time'] = re.findall(r'\d+:\d+', options[3].strip())[0]
+        if replay is not None:
+            game_info_dict['replay'] = replay
+        return game_info_dict
+
+    def make_player_stat(self, name, profile_link, miniprofile, icon, cells):
+        mvps = re.findall(r'\d+', cells[5].strip())
+        player_stat_dict = dict()
+        player_stat_dict['player_name'] = name.strip()
+        player_stat_dict['profile_link'] = profile_link
+        player_stat_dict['steamid'] = str(steamidapi.make_steam64(miniprofile))
+        player_stat_dict['player_icon'] = icon
+        player_stat_dict['ping'] = cells[1].strip()
+        player_stat_dict['kills'] = cells[2].strip()
+        player_stat_dict['assists'] = cells[3].strip()
+        player_stat_dict['deaths'] = cells[4].strip()
+        player_stat_dict['mvps'] = mvps[0] if mvps else "0"
+        player_stat_dict['hs_percent'] = cells[6].strip()
+        player_stat_dict['score'] = cells[7].strip()
+        return player_stat_dict
+
+    def make_game_stat(self, game_score, teams):
+        game_stat_dict = {}
+        game_stat_dict['game_score'] = game_score.strip()
         game_stat_dict[self.team_names[0]] = teams[0]
         game_stat_dict[self.team_names[1]] = teams[1]
         game_stat_dict['status'] = self.check_game_status(game_stat_dict)
         return game_stat_dict
 
+    def parse_games_cheats_stat(self, games, bans):
+        cheats_stats = []
+        for game in games:
+            payload = [bans[p['steamid']] for p in self.get_game_players(game) if p['steamid'] in bans]
+            cheats_stats.append(self.parse_cheats_stat(payload, game['info']['date']))
+        return cheats_stats
+
     def parse_cheats_stat(self, data, date):
         cheats_stat = []
         for player in data:
@@ -358,18 +315,324 @@ class CSGOApi(object):
             else:
                 return -1
 
+
+class CSGOApi(BaseCSGOApi):
+    _api_interface = None
+
+    @property
+    def api_interface(self):
+        # WebAPI downloads the interface list when created, so it is built on first use
+        if self._api_interface is None and self.api_key:
+            self._api_interface = webapi.WebAPI(self.api_key)
+        return self._api_interface
+
+    @api_interface.setter
+    def api_interface(self, value):
+        self._api_interface = value
+
+    @staticmethod
+    def check_steam_status(ttl=60):
+        with _steam_status_lock:
+            if _steam_status['value'] is not None and time.monotonic() - _steam_status['checked'] < ttl:
+                return _steam_status['value']
+            servers_con = cm.CMServerList()
+            servers_con.bootstrap_from_dns()
+            _steam_status['value'] = bool(len(servers_con))
+            _steam_status['checked'] = time.monotonic()
+            return _steam_status['value']
+
+    def login_in(self, username='', password='', timestamp='', captcha='', captcha_gid=-1,
+                 email_code='', steam_id='', twofactor_code='', language=None):
+        self.webclient = webauth.WebAuth(self.cache, scheduler=self.scheduler, metrics=self.metrics, **self.transport)
+        return self.webclient.login_raw(username, password, timestamp, captcha, captcha_gid,
+                                        email_code, steam_id, twofactor_code, language)
+
+    def resume_session(self, store):
+        data = store.load(self.username)
+        if not data:
+            return False
+        self.webclient = webauth.WebAuth(self.cache, scheduler=self.scheduler, metrics=self.metrics, **self.transport)
+        self.webclient.restore_session(data)
+        if not self.webclient.check_session():
+            store.delete(self.username)
+            self.webclient = None
+            return False
+        self.comm_link = self.comm_link or data.get('comm_link')
+        self.api_key = self.api_key or data.get('api_key')
+        return True
+
+    def main(self):
+        self.session_id = self.webclient.session_id
+        self.steamid = str(self.webclient.steam_id.as_64)
+        if not self.comm_link:
+            self.comm_link = self.webclient.get_(self.webclient.steam_id.community_url).url
+        if self.comm_link[-1] != '/':
+            self.comm_link += '/'
+        elif '/home/' in self.comm_link:
+            self.comm_link = self.comm_link.replace('/home/', '/')
+        if not self.api_key:
+            self.api_key = self.get_api_key()
+        self.limited = not self.api_key
+        me = self.load_me_full()
+        games = self.load_all_games()
+        return (me, games)
+
+    def get_html(self, url, params=None, use_cache=True):
+        key = self.cache.make_key(url, params, 'html')
+        html = self.cache.get(key) if use_cache else None
+        if html is None:
+            resp = self.webclient.get_(url, use_cache=use_cache, priority='interactive', params=params)
+            html = bs4.BeautifulSoup(resp.text, 'html.parser')
+            if use_cache and resp.ok:
+                self.cache.set(key, html)
+        return html
+
+    def get_api_key(self, use_cache=True):
+        html = self.get_html("https://steamcommunity.com/dev/apikey", use_cache=use_cache)
+        if html.find("div", {"id": "bodyContents_lo"}):
+            return None
+        if html.find("input", {"name": "Revoke"}) is not None:
+            return html.find("div", {"id": "bodyContents_ex"}).find_all("p")[0].text.strip().split(' ')[1]
+        else:
+            self.webclient.session.post("https://steamcommunity.com/dev/registerkey", data={
+                "domain": self.api_domain,
+                "agreeToTerms": "agreed",
+                "sessionid": self.session_id,
+                "Submit": "Register"
+            })
+            self.cache.invalidate("https://steamcommunity.com/dev/apikey")
+            return self.get_api_key(use_cache=False)
+
+    @timed('load_all_games')
+    def load_all_games(self):
+        csgo_games = {}
+        for mode in self.gamemodes:
+            csgo_games[mode] = self.load_games(mode)
+        return csgo_games
+
+    @timed('backfill_all_games')
+    def backfill_all_games(self, workers=None, max_in_flight=None):
+        with Backfill(self, workers, max_in_flight) as backfill:
+            return backfill.load_all_games()
+
+    @timed('load_new_games')
+    def load_new_games(self, gamemode, date=None):
+        return list(self.iter_games(gamemode, since=date))
+
+    @timed('load_games')
+    def load_games(self, gamemode, prefetch=False):
+        return list(self.iter_games(gamemode, prefetch=prefetch))
+
+    def iter_games(self, gamemode, since=None, prefetch=False):
+        for match_dict in self.iter_pages(gamemode, prefetch=prefetch):
+            seen = False
+            for game in self.parse_history_page(gamemode, match_dict["html"]):
+                if since is None or self.check_for_new(game["info"]["date"], since):
+                    yield game
+                else:
+                    seen = True
+            if seen:
+                return
+
+    def iter_pages(self, gamemode, continue_token=0, prefetch=False):
+        if prefetch:
+            yield from self._iter_prefetched_pages(gamemode, continue_token, int(prefetch))
+            return
+        pages = 0
+        try:
+            while continue_token is not None:
+                match_dict = self.get_games_history(gamemode, self.session_id, continue_token)
+                if not match_dict or not match_dict.get("html"):
+                    return
+                pages += 1
+                yield match_dict
+                continue_token = match_dict.get("continue_token")
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe('history_walk_pages', pages, gamemode=gamemode)
+
+    def _iter_prefetched_pages(self, gamemode, continue_token, depth):
+        pages = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def fetch():
+            try:
+                for match_dict in self.iter_pages(gamemode, continue_token):
+                    if stop.is_set():
+                        return
+                    put(match_dict)
+            except Exception as e:
+                put(e)
+            finally:
+                put(None)
+
+        threading.Thread(target=fetch, daemon=True).start()
+        try:
+            while True:
+                match_dict = pages.get()
+                if match_dict is None:
+                    return
+                if isinstance(match_dict, Exception):
+                    raise match_dict
+                yield match_dict
+        finally:
+            stop.set()
+
+    def sync_all_games(self, state):
+        csgo_games = {}
+        for mode in self.gamemodes:
+            csgo_games[mode] = self.sync_games(mode, state)
+        return csgo_games
+
+    def sync_games(self, gamemode, state):
+        cursor = state.get(self.steamid, gamemode)
+        games = []
+        if cursor["date"]:
+            games = self.sync_new_games(gamemode, state, cursor)
+        for match_dict in self.iter_pages(gamemode, cursor["continue_token"]):
+            data = self.parse_history_page(gamemode, match_dict["html"])
+            if data and not cursor["date"]:
+                cursor["date"] = self.newest_game_date(data)
+            games.extend(data)
+            cursor["continue_token"] = match_dict.get("continue_token")
+            state.set(self.steamid, gamemode, cursor)
+        return games
+
+    def sync_new_games(self, gamemode, state, cursor):
+        # "date" moves only when walk over new games reached an already seen game or the end of history,
+        # walk interrupted by a failed page is resumed from "head_token" on next sync
+        games = []
+        if cursor["head_token"] is not None:
+            if not self.walk_new_games(gamemode, state, cursor, cursor["head_token"], games):
+                return games
+        self.walk_new_games(gamemode, state, cursor, 0, games)
+        return games
+
+    def walk_new_games(self, gamemode, state, cursor, continue_token, games):
+        for match_dict in self.iter_pages(gamemode, continue_token):
+            if self.sync_new_page(gamemode, state, cursor, match_dict, games):
+                return True
+        return False
+
+    @timed('load_me_full')
+    def load_me_full(self):
+        return {"me": self.load_me(), "matchmaking_data": self.load_matchmaking_data(),
+                "cooldown": self.load_cooldown_status()}
+
+    @timed('load_me')
+    def load_me(self):
+        steam_profile = self.get_html(self.comm_link)
+        if steam_profile.find("div", {"class": "welcome_header_ctn"}):
+            return {}
+        return self.parse_me(steam_profile, self.load_me_ban_status())
+
+    def load_profile(self, steamid=None):
+        if steamid is None or str(steamid) == self.steamid:
+            return Profile(self, self.steamid, profile_link=self.comm_link)
+        return Profile(self, steamid)
+
+    def load_profiles(self, steamids):
+        return load_profiles(self, steamids)
+
+    @timed('load_matchmaking_data')
+    def load_matchmaking_data(self):
+        return self.parse_matchmaking_data(self.get_html(urljoin(self.comm_link, 'gcpd/730/'),
+                                                         params=dict(tab='matchmaking')))
+
+    @timed('load_me_ban_status')
+    def load_me_ban_status(self):
+        if not self.limited:
+            return self.parse_player_ban(self.get_player_ban_status(self.steamid))
+        else:
+            # develop alternate method for check
+            return {'banned': None, 'VAC': None, 'overwatch': None}
+
+    @timed('load_cooldown_status')
+    def load_cooldown_status(self):
+        return self.parse_cooldown_status(self.get_html(urljoin(self.comm_link, 'gcpd/730/'),
+                                                        params=dict(tab='matchmaking')))
+
+    def get_player_steamid(self, community_links):
+        if isinstance(community_links, list):
+            return self.resolver.resolve(community_links)
+        else:
+            steamid = self.resolver.resolve_one(community_links)
+            return str(steamid) if steamid is not None else None
+
+    def get_steam_profile_info(self, steamids):
+        if isinstance(steamids, list):
+            return self.extract_json(self.webclient.get_(urljoin(steam_misc['api'],
+                                                                 "ISteamUser/GetPlayerSummaries/v2/"),
+                                                         use_cache=False,
+                                                         params=dict(key=self.api_key, steamids=",".join(steamids)))
+                                     .text)['response']['players']
+        else:
+            return self.extract_json(self.webclient.get_(urljoin(steam_misc['api'],
+                                                                 "ISteamUser/GetPlayerSummaries/v2/"),
+                                                         params=dict(key=self.api_key, steamids=steamids))
+                                     .text)['response']['players'][0]
+
+    def get_player_ban_status(self, steamids):
+        if isinstance(steamids, list):
+            return self.extract_json(self.webclient.get_(urljoin(steam_misc['api'], "ISteamUser/GetPlayerBans/v1/"),
+                                                         use_cache=False,
+                                                         params=dict(key=self.api_key, steamids=",".join(steamids)))
+                                     .text)['players']
+        else:
+            return self.extract_json(self.webclient.get_(urljoin(steam_misc['api'], "ISteamUser/GetPlayerBans/v1/"),
+                                                         params=dict(key=self.api_key, steamids=steamids))
+                                     .text)['players'][0]
+
+    @timed('get_player_bans')
+    def get_player_bans(self, steamids, use_cache=True):
+        bans, missing = self.split_cached_bans(steamids, use_cache)
+        for i in range(0, len(missing), self.ban_chunk_size):
+            for player in self.get_player_ban_status(missing[i:i + self.ban_chunk_size]):
+                self.ban_cache.set(player['SteamId'], player)
+                bans[player['SteamId']] = player
+        return bans
+
+    def get_games_history(self, gamemode, session_id, continue_token):
+        gamemode = 'matchhistorycompetitive' if gamemode == self.gamemodes[0] else 'matchhistorywingman'
+        try:
+            resp = self.webclient.get_(urljoin(self.comm_link, 'gcpd/730/'), use_cache=False, priority='background',
+                                       params=dict(ajax=1, tab=gamemode,
+                                                   continue_token=continue_token,
+                                                   sessionid=session_id))
+            dict_resp = self.extract_json(resp.text)
+            return dict_resp
+        except json.decoder.JSONDecodeError:
+            pass
+        return None
+
+    def get_game_cheats_stat(self, game):
+        return self.get_games_cheats_stat([game])[0]
+
+    @timed('get_games_cheats_stat')
+    def get_games_cheats_stat(self, games):
+        if self.limited:
+            return [[] for _ in games]
+        bans = self.get_player_bans([p['steamid'] for game in games for p in self.get_game_players(game)])
+        return self.parse_games_cheats_stat(games, bans)
+
     def cli_login_in(self, password):
-        self.webclient = WebAuth()
-        rsa = WebAuth.get_rsa(self.username)
-        key = rsa_publickey(int(rsa['publickey_mod'], 16),
-                            int(rsa['publickey_exp'], 16))
-        self.webclient.login_raw(self.username, b64encode(pkcs1v15_encrypt(key, password.encode('ascii'))),
-                                 rsa['timestamp'])
+        self.webclient = webauth.WebAuth(self.cache, scheduler=self.scheduler, metrics=self.metrics, **self.transport)
+        rsa = self.webclient.get_rsa_key(self.username)
+        self.webclient.login_raw(self.username, self.encrypt_password(rsa, password), rsa['timestamp'])
 
     def cli_main(self):
         self.session_id = self.webclient.session_id
         self.steamid = str(self.webclient.steam_id.as_64)
-        self.comm_link = self.webclient.get_(self.webclient.steam_id.community_url).url
+        if not self.comm_link:
+            self.comm_link = self.webclient.get_(self.webclient.steam_id.community_url).url
         if self.comm_link[-1] != '/':
             self.comm_link += '/'
         elif '/home/' in self.comm_link:
@@ -378,16 +641,18 @@ class CSGOApi(object):
         print("Link: " + self.comm_link)
         if not self.api_key:
             self.api_key = self.get_api_key()
-            if self.api_key:
-                self.api_interface = webapi.WebAPI(self.api_key)
-                self.limited = False
-                print(self.api_key)
-            else:
-                self.limited = True
-                print("Limited account")
+        if self.api_key:
+            self.limited = False
+            print(self.api_key)
+        else:
+            self.limited = True
+            print("Limited account")
         print("Program start time: " + str(datetime.datetime.now().time()))
         games = self.load_all_games()
         me = self.load_me_full()
+        if self.metrics is not None:
+            print(self.metrics.to_prometheus())
+        return (me, games)
 
 
 if __name__ == '__main__':
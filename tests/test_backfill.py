@@ -0,0 +1,27 @@
+import asyncio
+
+from benchmarks.fixtures import account_steamid, make_history, page_index
+from steam_csgo import CSGOApi
+from steam_csgo.aio import AsyncCSGOApi
+
+
+class PagesApi(AsyncCSGOApi):
+    """Serves generated match history pages without network."""
+
+    def __init__(self, matches):
+        super().__init__('backfill', _scheduler=None, _parser='stream')
+        self.steamid = account_steamid()
+        self.pages = {mode: make_history(mode, matches) for mode in self.gamemodes}
+
+    async def get_games_history(self, gamemode, session_id, continue_token):
+        return self.pages[gamemode][page_index(continue_token)]
+
+
+def test_async_backfill_matches_parsed_pages():
+    api = PagesApi(40)
+    games = asyncio.run(api.backfill_all_games(workers=2, max_in_flight=2))
+    parser = CSGOApi('parser', _scheduler=None, _parser='stream')
+    parser.steamid = account_steamid()
+    assert games == {mode: [game for page in pages for game in parser.parse_games(mode, page['html'])]
+                     for mode, pages in api.pages.items()}
+    assert api.resolver.cache.links
@@ -0,0 +1,50 @@
+import io
+
+import requests
+from steam import webauth
+
+from steam_csgo.batch import BatchRunner
+
+
+def stub_api(errors):
+    class StubApi(object):
+        logins = 0
+
+        def __init__(self, username, _api_key=None):
+            self.username = username
+            self.steamid = '76561197960265728'
+
+        def cli_login_in(self, password):
+            StubApi.logins += 1
+            if errors:
+                raise errors.pop(0)
+
+        def main(self):
+            return {}, {}
+    return StubApi
+
+
+def run(errors, retries=2):
+    api_class = stub_api(errors)
+    runner = BatchRunner([{'username': 'user', 'password': 'password'}], io.StringIO(), workers=1, retries=retries,
+                         api_class=api_class)
+    return runner.process(runner.accounts[0]), api_class.logins
+
+
+def test_login_errors_are_not_retried():
+    for error in (webauth.LoginIncorrect('wrong password'), webauth.CaptchaRequired('captcha'),
+                  webauth.CaptchaRequiredLoginIncorrect('captcha'), webauth.EmailCodeRequired('email'),
+                  webauth.TwoFactorCodeRequired('code')):
+        result, logins = run([error])
+        assert logins == 1
+        assert result['error'].startswith(type(error).__name__)
+
+
+def test_transport_and_server_errors_are_retried():
+    server_error = requests.Response()
+    server_error.status_code = 503
+    result, logins = run([webauth.HTTPError('timeout'), requests.ConnectionError('reset'),
+                          requests.HTTPError(response=server_error)], retries=3)
+    assert logins == 4 and 'error' not in result
+    result, logins = run([requests.ConnectionError('reset')] * 3)
+    assert logins == 3 and result['error'].startswith('ConnectionError')
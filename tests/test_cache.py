@@ -0,0 +1,83 @@
+from steam_csgo import CSGOApi
+from steam_csgo import cache as cache_module
+from steam_csgo.cache import ResponseCache
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class BansApi(CSGOApi):
+    """Answers GetPlayerBans from memory and records the steamids of every request."""
+
+    def __init__(self):
+        super().__init__('bans', _scheduler=None)
+        self.requests = []
+
+    def get_player_ban_status(self, steamids):
+        self.requests.append(list(steamids))
+        return [{"SteamId": steamid, "VACBanned": False, "NumberOfGameBans": 0} for steamid in steamids]
+
+
+def steamids(count, start=0):
+    return [str(76561197960265728 + i) for i in range(start, start + count)]
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'monotonic', clock)
+    cache = ResponseCache(ttl=60)
+    cache.set('short', 1, ttl=10)
+    cache.set('default', 2)
+    cache.set('forever', 3, ttl=None)
+    clock.now += 11
+    assert cache.get('short') is None
+    assert cache.get('default') == 2
+    clock.now += 50
+    assert cache.get('default') is None
+    assert cache.get('forever') == 3
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_zero_ttl_bypasses_cache():
+    cache = ResponseCache()
+    cache.set('a', 1)
+    cache.set('a', 2, ttl=0)
+    assert 'a' not in cache
+    disabled = ResponseCache(ttl=0)
+    disabled.set('b', 1)
+    assert len(disabled) == 0
+
+
+def test_player_bans_are_cached():
+    api = BansApi()
+    first = api.get_player_bans(steamids(3))
+    assert set(first) == set(steamids(3))
+    api.get_player_bans(steamids(4))
+    assert api.requests == [steamids(3), steamids(1, 3)]
+    api.get_player_bans(steamids(2), use_cache=False)
+    assert api.requests[-1] == steamids(2)
+
+
+def test_player_bans_are_requested_by_100_ids():
+    api = BansApi()
+    ids = steamids(250)
+    bans = api.get_player_bans(ids + ids[:10])
+    assert [len(chunk) for chunk in api.requests] == [100, 100, 50]
+    assert sum(api.requests, []) == ids
+    assert len(bans) == 250
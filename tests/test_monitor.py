@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+from benchmarks.fixtures import account_steamid, make_history
+from steam_csgo import CSGOApi, MatchStore
+from steam_csgo.aio import AsyncCSGOApi
+from steam_csgo.monitor import BanMonitor
+
+DAY = 86400
+
+
+def clean_ban(steamid):
+    return {'SteamId': steamid, 'VACBanned': False, 'NumberOfVACBans': 0, 'NumberOfGameBans': 0,
+            'DaysSinceLastBan': 0}
+
+
+class BansApi(CSGOApi):
+    """Answers GetPlayerBans from a dict of changed bans, everyone else is clean."""
+
+    def __init__(self):
+        super().__init__('monitor', _scheduler=None)
+        self.bans = {}
+        self.requested = []
+
+    def get_player_ban_status(self, steamids):
+        self.requested.extend(steamids)
+        return [self.bans.get(steamid, clean_ban(steamid)) for steamid in steamids]
+
+
+class AsyncBansApi(AsyncCSGOApi):
+    def __init__(self):
+        super().__init__('monitor', _scheduler=None)
+        self.bans = {}
+
+    async def get_player_ban_status(self, steamids):
+        return [self.bans.get(steamid, clean_ban(steamid)) for steamid in steamids]
+
+
+def make_store():
+    api = CSGOApi('monitor', _scheduler=None)
+    api.steamid = account_steamid()
+    store = MatchStore(':memory:')
+    store.add_games(api.steamid, [game for page in make_history('competitive', 20)
+                                  for game in api.parse_games('competitive', page['html'])])
+    players = [str(row['steamid']) for row in store.query("SELECT steamid FROM players WHERE steamid != ?",
+                                                          (int(api.steamid),))]
+    return store, players
+
+
+def ban_two(api, players):
+    api.bans[players[0]] = dict(clean_ban(players[0]), NumberOfGameBans=1)
+    api.bans[players[1]] = dict(clean_ban(players[1]), VACBanned=True, NumberOfVACBans=2, DaysSinceLastBan=20000)
+
+
+def test_new_bans_are_reported_with_after_last_seen_flag():
+    store, players = make_store()
+    api = BansApi()
+    monitor = BanMonitor(api, store, batch_size=1000)
+    now = time.time()
+    assert monitor.step(now) == []
+    assert sorted(api.requested) == sorted(players)
+    assert monitor.step(now + 1) == []
+    ban_two(api, players)
+    changes = {change['steamid']: change for change in monitor.step(now + 4 * DAY + 1)}
+    assert set(changes) == set(players[:2])
+    assert changes[players[0]]['new_ov'] == 1 and changes[players[0]]['after'] is True
+    assert changes[players[1]]['new_VAC'] == 2 and changes[players[1]]['after'] is False
+    assert monitor.step(now + 8 * DAY + 2) == []
+
+
+def test_candidates_are_limited_and_oldest_first():
+    store, players = make_store()
+    monitor = BanMonitor(BansApi(), store, every=1, batch_size=5)
+    now = int(time.time())
+    store.add_bans([clean_ban(steamid) for steamid in players[5:]], now - 10 * DAY)
+    store.add_bans([clean_ban(steamid) for steamid in players[:5]], now - 20 * DAY)
+    assert sorted(str(row['steamid']) for row in monitor.candidates(now)) == sorted(players[:5])
+    assert monitor.candidates(now - 20 * DAY) == []
+
+
+def test_async_step_uses_async_client():
+    store, players = make_store()
+    api = AsyncBansApi()
+    monitor = BanMonitor(api, store, batch_size=1000)
+    now = time.time()
+    assert asyncio.run(monitor.step_async(now)) == []
+    ban_two(api, players)
+    changes = asyncio.run(monitor.step_async(now + 4 * DAY + 1))
+    assert sorted(change['steamid'] for change in changes) == sorted(players[:2])
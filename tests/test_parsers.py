@@ -0,0 +1,16 @@
+import pytest
+
+from benchmarks.fixtures import load_fixtures
+from steam_csgo import CSGOApi
+from steam_csgo.parsers import parser_backends
+
+
+@pytest.mark.parametrize('parser', ['bs4'] + sorted(parser_backends))
+def test_recorded_pages_keep_gamemode(parser):
+    for fixture in load_fixtures():
+        api = CSGOApi('parsers', _parser=parser, _scheduler=None)
+        api.steamid = fixture['steamid']
+        games = api.parse_games(fixture['gamemode'], fixture['html'])
+        assert games
+        assert {game['info']['gamemode'] for game in games} == {fixture['gamemode']}
+        assert all(game['info']['map'] and fixture['gamemode'] not in game['info']['map'] for game in games)
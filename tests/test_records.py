@@ -0,0 +1,26 @@
+from benchmarks.fixtures import load_fixtures
+from steam_csgo import CSGOApi, compact_games, expand_games
+from steam_csgo.analytics import stat_value
+from steam_csgo.records import from_int, to_int
+
+
+def test_to_int_keeps_sign_and_text():
+    assert to_int('-2') == -2
+    assert to_int('15%', '%') == 15
+    for value in ('-0', '07', '-', '+3', '1.5', ''):
+        assert from_int(to_int(value)) == value
+    assert stat_value(to_int('-2')) == -2
+
+
+def test_compact_round_trip_with_negative_values():
+    fixture = load_fixtures()[0]
+    api = CSGOApi('records', _scheduler=None)
+    api.steamid = fixture['steamid']
+    games = api.parse_games(fixture['gamemode'], fixture['html'])
+    players = api.get_game_players(games[0])
+    players[0]['score'] = '-2'
+    players[0]['kills'] = '-1'
+    players[1]['score'] = '-0'
+    records = compact_games({fixture['gamemode']: games})
+    assert records[fixture['gamemode']][0].players[0].score == -2
+    assert expand_games(records) == {fixture['gamemode']: games}
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+
+import requests
+
+from steam_csgo import RateLimitScheduler, WebAuth
+from steam_csgo.transport import TimeoutHTTPAdapter, make_retry
+
+URL = 'https://steamcommunity.com/profiles/76561197960265728/'
+
+
+def drained(rate=5.0):
+    scheduler = RateLimitScheduler(rates={'steamcommunity.com': rate}, burst=1)
+    scheduler.acquire(URL)
+    return scheduler
+
+
+def status_adapter(statuses):
+    class StatusAdapter(TimeoutHTTPAdapter):
+        def send(self, request, **kwargs):
+            resp = requests.Response()
+            resp.status_code = statuses.pop(0)
+            resp.url = request.url
+            resp.request = request
+            return resp
+    return StatusAdapter
+
+
+def test_interactive_requests_go_before_queued_background_ones():
+    scheduler = drained()
+    order = []
+
+    def acquire(priority):
+        scheduler.acquire(URL, priority)
+        order.append(priority)
+
+    background = threading.Thread(target=acquire, args=('background',))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=acquire, args=('interactive',))
+    interactive.start()
+    background.join()
+    interactive.join()
+    assert order == ['interactive', 'background']
+
+
+def test_rate_is_halved_after_429():
+    scheduler = RateLimitScheduler(rates={'steamcommunity.com': 4.0})
+    scheduler.report(URL, 429)
+    scheduler.report(URL, 429)
+    stats = scheduler.stats()['steamcommunity.com']
+    assert stats['rate'] == 1.0 and stats['throttled'] == 2
+    scheduler.report(URL, 200)
+    assert 1.0 < scheduler.stats()['steamcommunity.com']['rate'] < 4.0
+
+
+def test_acquire_async_keeps_priority_order():
+    scheduler = drained(rate=10.0)
+    order = []
+
+    async def acquire(priority, delay):
+        await asyncio.sleep(delay)
+        await scheduler.acquire_async(URL, priority)
+        order.append(priority)
+
+    async def run():
+        await asyncio.gather(acquire('background', 0), acquire('default', 0.01), acquire('interactive', 0.02))
+
+    asyncio.run(run())
+    assert order == ['interactive', 'default', 'background']
+    assert scheduler.stats()['steamcommunity.com']['requests'] == 4
+
+
+def test_status_retries_take_scheduler_tokens():
+    scheduler = RateLimitScheduler(rates={'steamcommunity.com': 100.0}, burst=10)
+    statuses = [429, 503, 200]
+    client = WebAuth(scheduler=scheduler, retry=make_retry(3, 0, 0), adapter_class=status_adapter(statuses))
+    assert client.get_(URL).status_code == 200
+    stats = scheduler.stats()['steamcommunity.com']
+    assert stats['requests'] == 3 and stats['throttled'] == 1 and not statuses
+    assert client.session.get_adapter(URL).max_retries.status_forcelist == frozenset()
+    statuses.append(200)
+    assert not client.check_session()
+    assert scheduler.stats()['steamcommunity.com']['requests'] == 4
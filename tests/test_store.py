@@ -0,0 +1,56 @@
+from benchmarks.fixtures import account_steamid, load_fixtures, make_history
+from steam_csgo import CSGOApi, MatchStore
+
+
+def parse_history(gamemode, matches):
+    api = CSGOApi('store', _scheduler=None)
+    api.steamid = account_steamid()
+    return [game for page in make_history(gamemode, matches) for game in api.parse_games(gamemode, page['html'])]
+
+
+def test_games_round_trip():
+    games = {'competitive': parse_history('competitive', 30), 'wingman': parse_history('wingman', 10)}
+    with MatchStore(':memory:') as store:
+        assert store.add_games(account_steamid(), games) == 40
+        stored = store.games(account_steamid())
+    expected = sorted(games['competitive'] + games['wingman'], key=lambda game: CSGOApi.time(game['info']['date']),
+                      reverse=True)
+    assert stored == expected
+
+
+def test_games_with_keeps_per_match_avatar():
+    api = CSGOApi('store', _scheduler=None)
+    games = parse_history('competitive', 16)
+    icons = {game['info']['date']: player['player_icon'] for game in games
+             for player in api.get_game_players(game) if player['steamid'] == account_steamid()}
+    assert len(set(icons.values())) > 1
+    with MatchStore(':memory:') as store:
+        store.add_games(account_steamid(), games)
+        for game in store.games_with(account_steamid()):
+            for player in api.get_game_players(game):
+                if player['steamid'] == account_steamid():
+                    assert player['player_icon'] == icons[game['info']['date']]
+
+
+def test_recorded_page_round_trip():
+    for fixture in load_fixtures():
+        api = CSGOApi('store', _scheduler=None)
+        api.steamid = fixture['steamid']
+        games = api.parse_games(fixture['gamemode'], fixture['html'])
+        with MatchStore(':memory:') as store:
+            store.add_games(fixture['steamid'], games)
+            assert store.games() == sorted(games, key=lambda game: CSGOApi.time(game['info']['date']), reverse=True)
+
+
+def test_fetched_pages_feed_link_cache():
+    fixture = load_fixtures()[0]
+    api = CSGOApi('store', _scheduler=None)
+    api.steamid = fixture['steamid']
+    games = api.parse_games(fixture['gamemode'], fixture['html'])
+    assert not api.resolver.cache.links
+    assert api.parse_history_page(fixture['gamemode'], fixture['html']) == games
+    vanity = [player for game in games for player in api.get_game_players(game) if '/id/' in player['profile_link']]
+    assert vanity
+    steamids, missing = api.resolver.resolve_local([player['profile_link'] for player in vanity])
+    assert not missing
+    assert [str(steamid) for steamid in steamids] == [player['steamid'] for player in vanity]
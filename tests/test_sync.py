@@ -0,0 +1,76 @@
+import datetime
+
+from steam_csgo import CSGOApi, SyncState
+
+PAGE_SIZE = 8
+
+
+class HistoryApi(CSGOApi):
+    """Serves match history from memory, tokens count games left below the page like steam ones stay stable."""
+
+    def __init__(self):
+        super().__init__('sync', _scheduler=None)
+        self.steamid = '76561197972611406'
+        self.dates = []
+        self.fail = set()
+
+    def add_games(self, count):
+        newest = self.time(self.dates[0]) if self.dates else datetime.datetime(2021, 1, 1)
+        self.dates = [(newest + datetime.timedelta(hours=i + 1)).strftime("%Y-%m-%d %H:%M:%S GMT")
+                      for i in reversed(range(count))] + self.dates
+
+    def get_games_history(self, gamemode, session_id, continue_token):
+        start = 0 if str(continue_token) == '0' else len(self.dates) - int(continue_token)
+        if start in self.fail:
+            self.fail.discard(start)
+            return None
+        end = min(start + PAGE_SIZE, len(self.dates))
+        return {"html": self.dates[start:end], "continue_token": str(len(self.dates) - end) if end < len(self.dates)
+                else None}
+
+    def parse_games(self, gamemode, html):
+        return [{"info": {"date": date}, "stat": {}} for date in html]
+
+
+def synced_dates(games):
+    return [game["info"]["date"] for game in games]
+
+
+def test_sync_loads_full_history_then_only_new_games():
+    api = HistoryApi()
+    api.add_games(20)
+    state = SyncState()
+    assert synced_dates(api.sync_games('competitive', state)) == api.dates
+    assert api.sync_games('competitive', state) == []
+    api.add_games(3)
+    assert synced_dates(api.sync_games('competitive', state)) == api.dates[:3]
+
+
+def test_sync_resumes_new_games_after_failed_page(tmp_path):
+    api = HistoryApi()
+    api.add_games(20)
+    path = str(tmp_path / 'state.json')
+    api.sync_games('competitive', SyncState(path))
+    api.add_games(40)
+    api.fail.add(PAGE_SIZE)
+    first = synced_dates(api.sync_games('competitive', SyncState(path)))
+    assert first == api.dates[:PAGE_SIZE]
+    second = synced_dates(api.sync_games('competitive', SyncState(path)))
+    assert first + second == api.dates[:40]
+    assert api.sync_games('competitive', SyncState(path)) == []
+
+
+def test_sync_keeps_new_games_arrived_while_walk_was_interrupted():
+    api = HistoryApi()
+    api.add_games(20)
+    state = SyncState()
+    api.sync_games('competitive', state)
+    api.add_games(40)
+    api.fail.add(PAGE_SIZE)
+    games = synced_dates(api.sync_games('competitive', state))
+    api.add_games(5)
+    api.fail.add(0)
+    games += synced_dates(api.sync_games('competitive', state))
+    games += synced_dates(api.sync_games('competitive', state))
+    assert sorted(games, reverse=True) == api.dates[:45]
+    assert len(games) == 45
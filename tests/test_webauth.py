@@ -0,0 +1,18 @@
+import warnings
+
+import pytest
+from steam import webauth
+
+from steam_csgo import WebAuth
+
+
+def test_login_language_is_deprecated(monkeypatch):
+    client = WebAuth(scheduler=None)
+    monkeypatch.setattr(client, '_send_raw', lambda **kwargs: {'success': False, 'message': 'wrong password'})
+    with pytest.warns(DeprecationWarning, match='language'):
+        with pytest.raises(webauth.LoginIncorrect):
+            client.login_raw('user', 'password', 'timestamp', language='russian')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        with pytest.raises(webauth.LoginIncorrect):
+            client.login_raw('user', 'password', 'timestamp')